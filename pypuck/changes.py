@@ -0,0 +1,227 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+A change-data feed for the player_stats and team_stats endpoints.
+
+The previous result of each query is kept, and each new result is
+compared with it on its primary key to find the inserted, updated and
+deleted rows. The rows are compared by a hash of the values in the
+columns both results share, with numeric columns compared as floats,
+so a poll only returns the rows that changed since the last one.
+Added and removed columns are reported separately.
+
+Example:
+>>> from pypuck import changes
+>>> delta = changes.team_stats_changes(start_season='20192020',
+                                       end_season='20192020')
+>>> delta.updated
+"""
+
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from pypuck import pypuck
+
+# The primary key of each endpoint's dataframe
+PRIMARY_KEYS = {'player_stats': ['playerId'],
+                'team_stats': ['teamId', 'seasonId']}
+
+Delta = namedtuple('Delta', ['inserted', 'updated', 'deleted',
+                             'added_columns', 'removed_columns'])
+Delta.__doc__ = """
+The rows that changed between two snapshots of a query.
+
+inserted and updated hold the new rows, deleted holds the rows of the
+previous snapshot that are no longer returned. Rows are only updated
+if a column of both snapshots changed; added_columns and
+removed_columns list the columns only in the new or previous snapshot.
+"""
+
+
+class SnapshotStore:
+    """
+    Keeps the last snapshot of each query and diffs new results with it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = {}
+
+    def diff(self, key, df, primary_key, update=True):
+        """
+        Compare a query result with the previous snapshot of the query.
+
+        On the first call for a key every row is inserted. The column
+        order and numeric dtypes (e.g. int becoming float when a null
+        appears) don't make rows updated.
+
+        Parameters
+        ----------
+        key : hashable
+          The query key, e.g. df.attrs['query_key'].
+        df : pandas.core.DataFrame
+          The new query result.
+        primary_key : list of str
+          The columns uniquely identifying a row.
+        update : boolean (default True)
+          Whether to keep df as the snapshot for the next diff. Use False
+          to preview a delta without consuming it.
+
+        Returns
+        -------
+        Delta
+          The inserted, updated and deleted rows, and the added and
+          removed columns.
+        """
+        missing = set(primary_key).difference(df.columns)
+        if missing:
+            raise ValueError(f"Missing primary key columns {sorted(missing)}")
+        new_index = pd.MultiIndex.from_frame(df[primary_key])
+        if new_index.has_duplicates:
+            raise ValueError(f"Duplicate primary key values in "
+                             f"{primary_key}")
+        columns = list(df.columns)
+        new_hashes = _row_hashes(df, columns)
+
+        with self._lock:
+            previous = self._snapshots.get(key)
+            if update:
+                self._snapshots[key] = (df, new_index, columns, new_hashes)
+
+        if previous is None:
+            return Delta(df, df.iloc[:0], df.iloc[:0], columns, [])
+        old_df, old_index, old_columns, old_hashes = previous
+
+        # Compare the columns both snapshots share, in the previous order
+        common = [column for column in old_columns if column in df]
+        added = [column for column in columns if column not in old_columns]
+        removed = [column for column in old_columns if column not in df]
+        if common != columns:
+            new_hashes = _row_hashes(df, common)
+        if common != old_columns:
+            old_hashes = _row_hashes(old_df, common)
+
+        # Position of each new row in the previous snapshot (-1 if new)
+        positions = old_index.get_indexer(new_index)
+        inserted = positions == -1
+        updated = np.zeros(len(df), dtype=bool)
+        updated[~inserted] = (old_hashes[positions[~inserted]] !=
+                              new_hashes[~inserted])
+        deleted = new_index.get_indexer(old_index) == -1
+        return Delta(df[inserted], df[updated], old_df[deleted], added,
+                     removed)
+
+    def clear(self, key=None):
+        """
+        Forget the snapshot of a query, or of every query.
+
+        Parameters
+        ----------
+        key : hashable (default None)
+          The query key to forget. If None all snapshots are removed.
+        """
+        with self._lock:
+            if key is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(key, None)
+
+
+def _row_hashes(df, columns):
+    """
+    Hash each row's values in the given columns.
+
+    Numeric columns are hashed as floats, so a column changing dtype
+    (e.g. int64 to float64 once a null appears) keeps its hashes.
+
+    Parameters
+    ----------
+    df : pandas.core.DataFrame
+      The rows to hash.
+    columns : list of str
+      The columns to hash, in order.
+
+    Returns
+    -------
+    numpy.ndarray
+      One hash per row.
+    """
+    df = df[columns]
+    numeric = df.select_dtypes(include='number').columns
+    df = df.astype({column: 'float64' for column in numeric})
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+# The snapshots used by player_stats_changes and team_stats_changes
+SNAPSHOTS = SnapshotStore()
+
+
+def player_stats_changes(start_date=None, end_date=None, store=None):
+    """
+    Query player_stats and return the rows changed since the last call.
+
+    Rows are identified by playerId. The first call for a date range
+    returns every row as inserted.
+
+    Parameters
+    ----------
+    start_date : str (default None).
+      The stat start date string in 'YYYY-MM-DD' format.
+    end_date : str (default None)
+      The stat end date string in 'YYYY-MM-DD' format.
+    store : SnapshotStore (default None)
+      Where the previous snapshots are kept, SNAPSHOTS if None.
+
+    Returns
+    -------
+    Delta
+      The inserted, updated and deleted player rows.
+
+    Examples
+    --------
+    >>> from pypuck import changes
+    >>> delta = changes.player_stats_changes(start_date='2019-10-02')
+    >>> delta.updated
+    """
+    df = pypuck.player_stats(start_date, end_date)
+    store = SNAPSHOTS if store is None else store
+    return store.diff(df.attrs['query_key'], df,
+                      PRIMARY_KEYS['player_stats'])
+
+
+def team_stats_changes(start_season="20192020", end_season="20192020",
+                       store=None):
+    """
+    Query team_stats and return the rows changed since the last call.
+
+    Rows are identified by teamId and seasonId. The first call for a
+    season range returns every row as inserted.
+
+    Parameters
+    ----------
+    start_season : str
+      The stat start year string in 'YYYYYYYY' format.
+    end_season : str
+      The stat end year string in 'YYYYYYYY' format.
+    store : SnapshotStore (default None)
+      Where the previous snapshots are kept, SNAPSHOTS if None.
+
+    Returns
+    -------
+    Delta
+      The inserted, updated and deleted team rows.
+
+    Examples
+    --------
+    >>> from pypuck import changes
+    >>> delta = changes.team_stats_changes(start_season='20192020',
+                                           end_season='20192020')
+    >>> delta.updated
+    """
+    df = pypuck.team_stats(start_season, end_season)
+    store = SNAPSHOTS if store is None else store
+    return store.diff(df.attrs['query_key'], df,
+                      PRIMARY_KEYS['team_stats'])
@@ -0,0 +1,502 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+The pypuck command line interface, used to export the pypuck
+endpoints to CSV, NDJSON or Parquet files.
+
+The requested season or date range is split into chunks which are
+fetched concurrently and written to the output in chunk order, so
+memory stays bounded by the number of chunks in flight. The export
+arguments and the chunks already written are recorded next to the
+output, so an interrupted export can be continued with --resume.
+
+Example:
+$ pypuck export team_stats --start 19801981 --end 19891990 \\
+      --format csv --output team_stats.csv
+$ pypuck export player_stats --start 2019-10-02 --end 2020-02-28 \\
+      --step-days 7 --format ndjson --output players.ndjson
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+import pandas as pd
+from pypuck import pypuck
+from pypuck.helpers import helpers
+
+
+def team_stats_chunks(args):
+    """
+    Split a team_stats export into one chunk per season.
+
+    Arguments:
+        args {argparse.Namespace} -- the parsed export arguments.
+
+    Returns:
+        list -- (chunk id, function) pairs, each function returning
+            the dataframe for its chunk.
+    """
+    start = '20192020' if args.start is None else args.start
+    end = start if args.end is None else args.end
+    helpers.check_season_format(start)
+    helpers.check_season_format(end)
+    helpers.check_seasons(start, end)
+
+    chunks = []
+    for year in range(int(start[:4]), int(end[:4]) + 1):
+        season = f'{year}{year + 1}'
+        chunks.append((season, _chunk(pypuck.team_stats, season, season)))
+    return chunks
+
+
+def player_stats_chunks(args):
+    """
+    Split a player_stats export into windows of --step-days days.
+
+    Each window returns its own top 100 players, with the window's
+    dates added as the 'startDate' and 'endDate' columns.
+
+    Arguments:
+        args {argparse.Namespace} -- the parsed export arguments.
+
+    Returns:
+        list -- (chunk id, function) pairs, each function returning
+            the dataframe for its chunk.
+    """
+    start = '2019-10-02' if args.start is None else args.start
+    end = '2020-04-11' if args.end is None else args.end
+    helpers.check_date_format(start)
+    helpers.check_date_format(end)
+    helpers.check_date(start, end)
+    if args.step_days < 1:
+        raise ValueError("Invalid step - step-days must be at least 1")
+
+    chunks = []
+    window_start = datetime.strptime(start, '%Y-%m-%d')
+    last = datetime.strptime(end, '%Y-%m-%d')
+    while window_start <= last:
+        window_end = min(window_start + timedelta(days=args.step_days - 1),
+                         last)
+        dates = (window_start.strftime('%Y-%m-%d'),
+                 window_end.strftime('%Y-%m-%d'))
+        chunks.append(('_'.join(dates), _chunk(_player_window, *dates)))
+        window_start = window_end + timedelta(days=1)
+    return chunks
+
+
+def draft_pick_chunks(args):
+    """
+    Split a draft_pick export for --pick and --round into one chunk
+    per draft year, each filtered on the NHL records API. Years without
+    the pick (e.g. early drafts with fewer picks per round) give empty
+    chunks.
+
+    Arguments:
+        args {argparse.Namespace} -- the parsed export arguments.
+
+    Returns:
+        list -- (chunk id, function) pairs, each function returning
+            the dataframe for its chunk.
+    """
+    start = 1963 if args.start is None else int(args.start)
+    end = 2018 if args.end is None else int(args.end)
+    helpers.check_draft_arguments(args.pick, args.round, start)
+    helpers.check_draft_arguments(args.pick, args.round, end)
+    if end < start:
+        raise ValueError("Invalid year range - end earlier than start")
+    return [(str(year), _chunk(_draft_year, args.pick, args.round, year))
+            for year in range(start, end + 1)]
+
+
+def attendance_chunks(args):
+    """
+    Make an attendance export, optionally restricted to a year range.
+
+    Arguments:
+        args {argparse.Namespace} -- the parsed export arguments.
+
+    Returns:
+        list -- (chunk id, function) pairs, each function returning
+            the dataframe for its chunk.
+    """
+    start = 1975 if args.start is None else int(args.start)
+    end = 2019 if args.end is None else int(args.end)
+    helpers.check_attendance_seasons(start, end)
+    return [(f'{start}_{end}', _chunk(_attendance_years, start, end))]
+
+
+# The export chunking for each endpoint
+ENDPOINTS = {'team_stats': team_stats_chunks,
+             'player_stats': player_stats_chunks,
+             'draft_pick': draft_pick_chunks,
+             'attendance': attendance_chunks}
+
+
+def _chunk(function, *args):
+    """
+    Bind a function to its arguments for a chunk.
+    """
+    return lambda: function(*args)
+
+
+def _player_window(start_date, end_date):
+    """
+    Get the top 100 players for a window, labelled with its dates.
+    """
+    df = pypuck.player_stats(start_date, end_date)
+    df.insert(0, 'startDate', start_date)
+    df.insert(1, 'endDate', end_date)
+    return df
+
+
+def _draft_year(pick_number, round_number, year):
+    """
+    Get the draft picks for a pick and round in a draft year, which
+    is an empty chunk if the year had no such pick.
+    """
+    return pypuck.draft_pick(pick_number, round_number, year,
+                             server_filter=True, allow_empty=True)
+
+
+def _attendance_years(start, end):
+    """
+    Get the attendance numbers within a year range.
+    """
+    return pypuck.attendance(start_season=start, end_season=end,
+                             output='pandas')
+
+
+class Progress:
+    """
+    The record of the chunks already written to an export.
+
+    The first line of the progress file is a JSON object with the
+    export arguments, so an export can only be resumed with the same
+    arguments. Each following line is a JSON object with the chunk id
+    and the output size after the chunk was written, so that a partly
+    written chunk can be truncated when the export is resumed.
+
+    Arguments:
+        path {str} -- the progress file path.
+        arguments {dict} -- the export arguments (default: {None}).
+
+    Raises:
+        ValueError: A message if the recorded export arguments differ.
+    """
+
+    def __init__(self, path, arguments=None):
+        self.path = path
+        self.done = {}
+        if not os.path.exists(path):
+            self._append({'arguments': arguments})
+            return
+        with open(path) as f:
+            header = f.readline()
+            try:
+                recorded = json.loads(header).get('arguments')
+            except ValueError:
+                recorded = None
+            if recorded != arguments:
+                raise ValueError(f"Can't resume - the export was started "
+                                 f"with different arguments {recorded}")
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A record interrupted while being written
+                    break
+                self.done[record['chunk']] = record['size']
+
+    @property
+    def size(self):
+        """
+        The output size once the recorded chunks were written.
+        """
+        return max(self.done.values(), default=0)
+
+    def record(self, chunk_id, size):
+        """
+        Records that a chunk was written.
+
+        Arguments:
+            chunk_id {str} -- the chunk id.
+            size {int} -- the output size after the chunk was written.
+        """
+        self.done[chunk_id] = size
+        self._append({'chunk': chunk_id, 'size': size})
+
+    def _append(self, record):
+        """
+        Appends a record to the progress file.
+        """
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def remove(self):
+        """
+        Removes the progress file once the export is complete.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class CsvWriter:
+    """
+    Appends chunks to a CSV file, using the first chunk's columns.
+
+    Arguments:
+        path {str} -- the output file path.
+        size {int} -- the size to truncate the file to when resuming.
+    """
+
+    def __init__(self, path, size=0):
+        self.file = open(path, 'a+', newline='')
+        self.file.truncate(size)
+        self.columns = None
+        if size > 0:
+            self.file.seek(0)
+            self.columns = list(pd.read_csv(self.file, nrows=0).columns)
+            self.file.seek(0, os.SEEK_END)
+
+    def write(self, df, chunk_id):
+        """
+        Writes a chunk and returns the output size.
+        """
+        header = self.columns is None
+        if header:
+            self.columns = list(df.columns)
+        df.reindex(columns=self.columns).to_csv(self.file, header=header,
+                                                index=False)
+        self.file.flush()
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class NdjsonWriter:
+    """
+    Appends chunks to a newline delimited JSON file.
+
+    Arguments:
+        path {str} -- the output file path.
+        size {int} -- the size to truncate the file to when resuming.
+    """
+
+    def __init__(self, path, size=0):
+        self.file = open(path, 'a')
+        self.file.truncate(size)
+
+    def write(self, df, chunk_id):
+        """
+        Writes a chunk and returns the output size.
+        """
+        if len(df) > 0:
+            lines = df.to_json(orient='records', lines=True)
+            self.file.write(lines if lines.endswith('\n') else lines + '\n')
+            self.file.flush()
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """
+    Writes each chunk to its own part file in a Parquet directory.
+
+    Arguments:
+        path {str} -- the output directory path.
+        size {int} -- unused, part files are rewritten when resuming.
+    """
+
+    def __init__(self, path, size=0):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, df, chunk_id):
+        """
+        Writes a chunk and returns the output size.
+        """
+        df.to_parquet(os.path.join(self.path, f'part-{chunk_id}.parquet'),
+                      index=False)
+        return 0
+
+    def close(self):
+        pass
+
+
+# The writer for each output format
+FORMATS = {'csv': CsvWriter, 'ndjson': NdjsonWriter,
+           'parquet': ParquetWriter}
+
+
+def export(chunks, output, output_format='csv', workers=4, resume=False,
+           log=None, arguments=None):
+    """
+    Fetches the chunks concurrently and writes them in chunk order.
+
+    Chunks fetched ahead of an earlier chunk wait in a reorder buffer.
+    At most twice as many chunks as workers are fetched or waiting to
+    be written at once.
+
+    Arguments:
+        chunks {list} -- (chunk id, function) pairs to export.
+        output {str} -- the output file (or directory for Parquet).
+        output_format {str} -- 'csv', 'ndjson' or 'parquet'
+            (default: {'csv'}).
+        workers {int} -- the number of concurrent requests (default: {4}).
+        resume {bool} -- whether to continue an interrupted export
+            (default: {False}).
+        log {file} -- where to report progress (default: {None}).
+        arguments {dict} -- the export arguments, which must match the
+            interrupted export's when resuming (default: {None}).
+
+    Raises:
+        ValueError: A message if the output can't be written or resumed,
+            or workers is less than 1.
+
+    Returns:
+        int -- the number of rows written.
+    """
+    if workers < 1:
+        raise ValueError("Invalid workers - workers must be at least 1")
+    progress_path = _progress_path(output, output_format)
+    if resume and not os.path.exists(progress_path):
+        raise ValueError(f"Nothing to resume - {output} has no progress")
+    if not resume and os.path.exists(output):
+        raise ValueError(f"Output {output} already exists, "
+                         "use --resume to continue an interrupted export")
+
+    if output_format == 'parquet':
+        os.makedirs(output, exist_ok=True)
+    progress = Progress(progress_path, arguments)
+    # Drop anything written after the last recorded chunk
+    writer = FORMATS[output_format](output, progress.size)
+
+    pending = [chunk for chunk in chunks if chunk[0] not in progress.done]
+    rows = submitted = written = 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # The running chunks and the finished ones waiting for an
+            # earlier chunk, by their position in pending
+            running, finished = {}, {}
+            while written < len(pending):
+                while (submitted < len(pending) and
+                       len(running) + len(finished) < 2 * workers):
+                    running[pool.submit(pending[submitted][1])] = submitted
+                    submitted += 1
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished[running.pop(future)] = future.result()
+                while written in finished:
+                    chunk_id = pending[written][0]
+                    df = finished.pop(written)
+                    size = writer.write(df, chunk_id)
+                    progress.record(chunk_id, size)
+                    rows += len(df)
+                    written += 1
+                    if log is not None:
+                        print(f"Wrote {chunk_id} ({len(df)} rows)", file=log)
+    finally:
+        writer.close()
+
+    progress.remove()
+    return rows
+
+
+def _progress_path(output, output_format):
+    """
+    Get the progress file path for an export.
+
+    Arguments:
+        output {str} -- the output file (or directory for Parquet).
+        output_format {str} -- 'csv', 'ndjson' or 'parquet'.
+
+    Returns:
+        str -- the progress file path.
+    """
+    if output_format == 'parquet':
+        # The progress file lives inside the Parquet directory
+        return os.path.join(output, '_progress')
+    return output + '.progress'
+
+
+def main(argv=None):
+    """
+    Runs the pypuck command line interface.
+
+    Arguments:
+        argv {list} -- the command line arguments (default: {None},
+            i.e. sys.argv).
+
+    Returns:
+        int -- the exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog='pypuck',
+        description="Export the NHL.com API endpoints wrapped by pypuck.")
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    parser_export = commands.add_parser(
+        'export', help="Export an endpoint to CSV, NDJSON or Parquet.")
+    parser_export.add_argument('endpoint', choices=sorted(ENDPOINTS))
+    parser_export.add_argument(
+        '--start', help="The first season (YYYYYYYY) for team_stats, "
+        "date (YYYY-MM-DD) for player_stats, or year (YYYY) for "
+        "draft_pick and attendance.")
+    parser_export.add_argument(
+        '--end', help="The last season, date or year, in the same format "
+        "as --start.")
+    parser_export.add_argument(
+        '--step-days', type=int, default=7,
+        help="The player_stats window length in days (default: 7).")
+    parser_export.add_argument(
+        '--pick', type=int, default=1,
+        help="The draft_pick pick number (default: 1).")
+    parser_export.add_argument(
+        '--round', type=int, default=None,
+        help="The draft_pick round number (default: all rounds).")
+    parser_export.add_argument(
+        '--format', choices=sorted(FORMATS), default='csv',
+        help="The output format (default: csv). Parquet output is "
+        "a directory of part files and requires pyarrow.")
+    parser_export.add_argument(
+        '--output', required=True,
+        help="The output file, or directory for Parquet.")
+    parser_export.add_argument(
+        '--workers', type=int, default=4,
+        help="The number of concurrent requests (default: 4).")
+    parser_export.add_argument(
+        '--resume', action='store_true',
+        help="Continue an interrupted export, skipping written chunks.")
+    args = parser.parse_args(argv)
+
+    # The arguments deciding what is exported, checked when resuming
+    arguments = {name: getattr(args, name)
+                 for name in ['endpoint', 'start', 'end', 'step_days',
+                              'pick', 'round', 'format']}
+    try:
+        chunks = ENDPOINTS[args.endpoint](args)
+        rows = export(chunks, args.output, args.format, args.workers,
+                      args.resume, log=sys.stderr, arguments=arguments)
+    except Exception as e:
+        print(f"pypuck: error: {e}", file=sys.stderr)
+        if os.path.exists(_progress_path(args.output, args.format)):
+            print("The written chunks were kept, rerun with --resume "
+                  "to continue the export.", file=sys.stderr)
+        return 1
+    print(f"Exported {rows} rows to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+A locally materialized aggregate cube of team_stats across seasons.
+
+The cube holds the numeric team_stats columns keyed by (teamId,
+seasonId), along with their prefix sums over the seasons, so the totals
+and means for any season range are computed with one subtraction per
+team instead of a new API request. Refreshing the cube only requests
+the current season, and only the prefix sums from that season onward
+are updated.
+
+Example:
+>>> from pypuck import cube
+>>> teams = cube.TeamStatsCube.build(start_season='19701971',
+                                     end_season='20192020')
+>>> teams.totals(start_season='19801981', end_season='19891990')
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from pypuck import pypuck
+from pypuck.helpers import helpers, storage
+
+CUBE_FILE = 'team_stats_cube.csv'
+
+# The columns identifying a row rather than measuring something
+KEY_COLUMNS = ['teamId', 'seasonId']
+
+
+class TeamStatsCube:
+    """
+    Prefix sums of the team_stats columns over seasons, per team.
+
+    Totals are meaningful for count columns (e.g. goalsFor, points),
+    while means also make sense for rate columns (e.g. faceoffWinPct),
+    giving the average season. Missing stats (e.g. faceoffWinPct in
+    older seasons) count as zero in totals, and means only average the
+    seasons where the stat was recorded.
+
+    Parameters
+    ----------
+    df : pandas.core.DataFrame
+      The team_stats rows, with one row per teamId and seasonId.
+    """
+
+    def __init__(self, df):
+        self._lock = threading.Lock()
+        self._build(df)
+
+    @classmethod
+    def build(cls, start_season="19171918", end_season="20192020"):
+        """
+        Build the cube from team_stats and persist it.
+
+        Parameters
+        ----------
+        start_season : str
+          The first season in 'YYYYYYYY' format.
+        end_season : str
+          The last season in 'YYYYYYYY' format.
+
+        Returns
+        -------
+        TeamStatsCube
+          The cube of the seasons.
+        """
+        cube = cls(pypuck.team_stats(start_season, end_season))
+        cube.save()
+        return cube
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Load a persisted cube.
+
+        Parameters
+        ----------
+        path : str (default None)
+          The cube file, team_stats_cube.csv in the pypuck data
+          directory if None.
+
+        Returns
+        -------
+        TeamStatsCube
+          The persisted cube.
+        """
+        path = storage.path(CUBE_FILE) if path is None else path
+        return cls(pd.read_csv(path))
+
+    def save(self, path=None):
+        """
+        Persist the cube.
+
+        Parameters
+        ----------
+        path : str (default None)
+          The cube file, team_stats_cube.csv in the pypuck data
+          directory if None.
+        """
+        path = storage.path(CUBE_FILE) if path is None else path
+        with self._lock:
+            self.data.to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+
+    def totals(self, start_season, end_season):
+        """
+        Sum each team's stats over a season range.
+
+        Parameters
+        ----------
+        start_season : str
+          The first season in 'YYYYYYYY' format.
+        end_season : str
+          The last season in 'YYYYYYYY' format.
+
+        Returns
+        -------
+        pandas.core.DataFrame
+          One row per team that played in the range, with the number
+          of 'seasons' played and the summed stats.
+        """
+        return self._aggregate(start_season, end_season, mean=False)
+
+    def means(self, start_season, end_season):
+        """
+        Average each team's stats over the seasons they played in a range.
+
+        Parameters
+        ----------
+        start_season : str
+          The first season in 'YYYYYYYY' format.
+        end_season : str
+          The last season in 'YYYYYYYY' format.
+
+        Returns
+        -------
+        pandas.core.DataFrame
+          One row per team that played in the range, with the number
+          of 'seasons' played and the average season's stats.
+        """
+        return self._aggregate(start_season, end_season, mean=True)
+
+    def refresh(self, season=None, save=True):
+        """
+        Request a season again, e.g. the in-progress season, and update
+        the cube from that season onward.
+
+        Parameters
+        ----------
+        season : str (default None)
+          The season in 'YYYYYYYY' format, the latest season in the
+          cube if None. A season after the latest one is added.
+        save : boolean (default True)
+          Whether to persist the refreshed cube.
+        """
+        if season is None:
+            season = str(self.seasons[-1])
+        df = pypuck.team_stats(season, season)
+        with self._lock:
+            data = self.data[self.data.seasonId != int(season)]
+            data = pd.concat([data, df], ignore_index=True, sort=False)
+            position = np.searchsorted(self.seasons, int(season))
+            if (position < len(self.seasons) and
+                    self.seasons[position] == int(season) and
+                    set(df.teamId).issubset(self.teams) and
+                    set(self.columns).issubset(df.columns)):
+                self._update(data, position)
+            else:
+                # A new season, team or column changes the cube's shape
+                self._build(data)
+        if save:
+            self.save()
+
+    def _build(self, df):
+        """
+        Build the season by team by column values and their prefix sums.
+
+        Parameters
+        ----------
+        df : pandas.core.DataFrame
+          The team_stats rows.
+        """
+        numeric = df.select_dtypes(include='number').columns
+        self.columns = [c for c in numeric if c not in KEY_COLUMNS]
+        self.data = df.sort_values(KEY_COLUMNS).reset_index(drop=True)
+        self.seasons = np.sort(df.seasonId.unique())
+        self.teams = np.sort(df.teamId.unique())
+        self.names = (self.data.groupby('teamId').teamFullName.last()
+                      if 'teamFullName' in df else None)
+
+        values = np.zeros((len(self.seasons), len(self.teams),
+                           len(self.columns)))
+        recorded = np.zeros(values.shape)
+        played = np.zeros((len(self.seasons), len(self.teams)))
+        rows = np.searchsorted(self.seasons, self.data.seasonId)
+        cols = np.searchsorted(self.teams, self.data.teamId)
+        values[rows, cols], recorded[rows, cols] = self._stats(self.data)
+        played[rows, cols] = 1
+
+        # The prefix sums start with the empty range
+        self._values, self._recorded = values, recorded
+        self._played = played
+        self._sums = np.zeros((len(self.seasons) + 1,) + values.shape[1:])
+        self._valid = np.zeros(self._sums.shape)
+        self._counts = np.zeros((len(self.seasons) + 1, len(self.teams)))
+        np.cumsum(values, axis=0, out=self._sums[1:])
+        np.cumsum(recorded, axis=0, out=self._valid[1:])
+        np.cumsum(played, axis=0, out=self._counts[1:])
+
+    def _stats(self, df):
+        """
+        Get the stat values of some rows, with missing stats as zero,
+        and whether each stat was recorded.
+
+        Parameters
+        ----------
+        df : pandas.core.DataFrame
+          The team_stats rows.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+          The values and the recorded (1) or missing (0) flags.
+        """
+        values = df[self.columns].to_numpy(dtype=float)
+        recorded = ~np.isnan(values)
+        return np.where(recorded, values, 0), recorded.astype(float)
+
+    def _update(self, data, position):
+        """
+        Update one season's values and the prefix sums after it.
+
+        Parameters
+        ----------
+        data : pandas.core.DataFrame
+          The team_stats rows, including the updated season.
+        position : int
+          The position of the updated season.
+        """
+        self.data = data.sort_values(KEY_COLUMNS).reset_index(drop=True)
+        season = data[data.seasonId == self.seasons[position]]
+        cols = np.searchsorted(self.teams, season.teamId)
+        self._values[position] = 0
+        self._recorded[position] = 0
+        self._played[position] = 0
+        (self._values[position, cols],
+         self._recorded[position, cols]) = self._stats(season)
+        self._played[position, cols] = 1
+        self._sums[position + 1:] = (
+            self._sums[position] +
+            np.cumsum(self._values[position:], axis=0))
+        self._valid[position + 1:] = (
+            self._valid[position] +
+            np.cumsum(self._recorded[position:], axis=0))
+        self._counts[position + 1:] = (
+            self._counts[position] +
+            np.cumsum(self._played[position:], axis=0))
+
+    def _aggregate(self, start_season, end_season, mean):
+        """
+        Aggregate each team's stats over a season range.
+
+        Parameters
+        ----------
+        start_season : str
+          The first season in 'YYYYYYYY' format.
+        end_season : str
+          The last season in 'YYYYYYYY' format.
+        mean : boolean
+          Whether to average rather than sum the stats.
+
+        Returns
+        -------
+        pandas.core.DataFrame
+          One row per team that played in the range.
+        """
+        helpers.check_argument_type(start_season, 'start_season', str)
+        helpers.check_argument_type(end_season, 'end_season', str)
+        helpers.check_season_format(start_season)
+        helpers.check_season_format(end_season)
+        helpers.check_seasons(start_season, end_season)
+
+        with self._lock:
+            start = np.searchsorted(self.seasons, int(start_season), 'left')
+            end = np.searchsorted(self.seasons, int(end_season), 'right')
+            sums = self._sums[end] - self._sums[start]
+            valid = self._valid[end] - self._valid[start]
+            seasons = self._counts[end] - self._counts[start]
+            teams, names, columns = self.teams, self.names, self.columns
+
+        played = seasons > 0
+        sums = sums[played]
+        if mean:
+            # Each stat is averaged over the seasons it was recorded
+            valid = valid[played]
+            sums = np.divide(sums, valid, out=np.full(sums.shape, np.nan),
+                             where=valid > 0)
+        df = pd.DataFrame(sums, columns=columns)
+        df.insert(0, 'teamId', teams[played])
+        if names is not None:
+            df.insert(1, 'teamFullName',
+                      names.reindex(teams[played]).to_numpy())
+        df.insert(len(df.columns) - len(columns), 'seasons',
+                  seasons[played].astype(int))
+        return df
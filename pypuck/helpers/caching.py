@@ -0,0 +1,198 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This helper script is not designed to be used directly,
+rather it is a helper called by the pypuck module.
+
+Its purpose is to cache API results with a stale-while-revalidate
+policy, so that results for the in-progress season can be served
+immediately while they are refreshed in the background.
+
+Example:
+>>> from pypuck.helpers import caching
+>>> cache = caching.SWRCache(soft_ttl=300, hard_ttl=1800)
+>>> value, staleness = cache.get(key, fetch)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from pypuck.helpers import collector
+
+
+class SWRCache:
+    """
+    A stale-while-revalidate cache.
+
+    A cached value younger than the soft TTL is served as is.
+    A value older than the soft TTL is still served immediately,
+    but a background thread refreshes it for the next caller.
+    A value older than the hard TTL is never served, instead the
+    caller blocks while it is fetched again.
+
+    Every served value records how stale it is (in seconds) under
+    the 'cache.staleness' observation of the stats collector.
+
+    At most max_entries values are kept, evicting the least recently
+    used ones, and values past the hard TTL are dropped when next
+    looked up.
+
+    The cache is thread safe. Concurrent callers missing the same key
+    wait for a single fetch rather than each fetching it.
+
+    Arguments:
+        soft_ttl {float} -- seconds before a value is refreshed in the
+            background (default: {300}).
+        hard_ttl {float} -- seconds before a value must be refetched
+            by the caller (default: {1800}).
+        max_entries {int} -- the maximum number of cached values
+            (default: {256}).
+        stats {StatsCollector} -- where to record cache metrics
+            (default: {collector.STATS}).
+    """
+
+    def __init__(self, soft_ttl=300, hard_ttl=1800, stats=None,
+                 max_entries=256):
+        if soft_ttl > hard_ttl:
+            raise ValueError("Invalid TTLs - "
+                             "soft_ttl greater than hard_ttl")
+        if max_entries < 1:
+            raise ValueError("Invalid size - max_entries must be at least 1")
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.max_entries = max_entries
+        self.stats = collector.STATS if stats is None else stats
+        self._lock = threading.Lock()
+        # The values and their fetch times, least recently used first
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        # The fetch lock and number of waiting callers of each key
+        # being fetched, removed once no caller is waiting
+        self._fetch_locks = {}
+
+    def get(self, key, fetch):
+        """
+        Gets the value for a key, fetching it if needed.
+
+        Arguments:
+            key {hashable} -- the cache key (e.g. the query arguments).
+            fetch {callable} -- a function with no arguments that
+                fetches a fresh value.
+
+        Returns:
+            tuple -- the value and its staleness in seconds.
+        """
+        entry = self._usable(key)
+        if entry is None:
+            # Nothing usable is cached, the caller has to wait
+            with self._lock:
+                fetch_lock = self._fetch_locks.setdefault(
+                    key, [threading.Lock(), 0])
+                fetch_lock[1] += 1
+            try:
+                with fetch_lock[0]:
+                    # Another caller may have fetched it while we waited
+                    entry = self._usable(key)
+                    if entry is None:
+                        self.stats.increment('cache.miss')
+                        value = fetch()
+                        self._store(key, value)
+                        self.stats.observe('cache.staleness', 0.0)
+                        return value, 0.0
+            finally:
+                with self._lock:
+                    fetch_lock[1] -= 1
+                    if fetch_lock[1] == 0:
+                        del self._fetch_locks[key]
+
+        value, fetched_at = entry
+        staleness = time.monotonic() - fetched_at
+        self.stats.increment('cache.hit')
+        if staleness >= self.soft_ttl:
+            self._revalidate(key, fetch)
+
+        self.stats.observe('cache.staleness', staleness)
+        return value, staleness
+
+    def clear(self):
+        """
+        Removes all the cached values.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _usable(self, key):
+        """
+        Gets a key's entry if it is younger than the hard TTL, dropping
+        it if it is older.
+
+        Arguments:
+            key {hashable} -- the cache key.
+
+        Returns:
+            tuple -- the value and when it was fetched, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[1] >= self.hard_ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key, value):
+        """
+        Stores a freshly fetched value, evicting the least recently
+        used values past max_entries.
+
+        Arguments:
+            key {hashable} -- the cache key.
+            value {object} -- the fetched value.
+        """
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _revalidate(self, key, fetch):
+        """
+        Starts a background refresh of a key, unless one is running.
+
+        Arguments:
+            key {hashable} -- the cache key.
+            fetch {callable} -- a function that fetches a fresh value.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        thread = threading.Thread(target=self._refresh, args=(key, fetch),
+                                  daemon=True)
+        thread.start()
+
+    def _refresh(self, key, fetch):
+        """
+        Fetches a fresh value for a key and stores it.
+
+        A failed refresh keeps the stale value, which will be
+        served until it passes the hard TTL.
+
+        Arguments:
+            key {hashable} -- the cache key.
+            fetch {callable} -- a function that fetches a fresh value.
+        """
+        try:
+            value = fetch()
+        except Exception:
+            self.stats.increment('cache.refresh_error')
+        else:
+            self._store(key, value)
+            self.stats.increment('cache.refresh')
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
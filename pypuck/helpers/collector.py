@@ -0,0 +1,93 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This helper script is not designed to be used directly,
+rather it is a helper called by the pypuck module.
+
+Its purpose is to collect simple counters and observations
+(e.g. how stale a cached result was when it was served) about
+the calls made by the pypuck module.
+
+Example:
+>>> from pypuck.helpers import collector
+>>> collector.STATS.summary()
+"""
+
+import threading
+from collections import deque
+
+
+class StatsCollector:
+    """
+    A thread safe collection of named counters and observations.
+
+    Observations only keep the most recent values so the collector
+    uses a bounded amount of memory for long running processes.
+
+    Arguments:
+        max_observations {int} -- the number of recent values to keep
+            per observation name (default: {1000}).
+    """
+
+    def __init__(self, max_observations=1000):
+        self.max_observations = max_observations
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._observations = {}
+
+    def increment(self, name, value=1):
+        """
+        Increments a named counter.
+
+        Arguments:
+            name {str} -- the counter name.
+            value {int} -- the amount to increment by (default: {1}).
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name, value):
+        """
+        Records an observed value (e.g. a staleness in seconds).
+
+        Arguments:
+            name {str} -- the observation name.
+            value {float} -- the observed value.
+        """
+        with self._lock:
+            if name not in self._observations:
+                self._observations[name] = deque(
+                    maxlen=self.max_observations)
+            self._observations[name].append(value)
+
+    def summary(self):
+        """
+        Summarises the counters and observations.
+
+        Returns:
+            dict -- the counters, and the count, mean, max and last
+                value of each observation.
+        """
+        with self._lock:
+            summary = dict(self._counters)
+            for name, values in self._observations.items():
+                if not values:
+                    continue
+                summary[name] = {'count': len(values),
+                                 'mean': sum(values) / len(values),
+                                 'max': max(values),
+                                 'last': values[-1]}
+        return summary
+
+    def reset(self):
+        """
+        Clears all counters and observations.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._observations.clear()
+
+
+# The collector shared by the pypuck module
+STATS = StatsCollector()
@@ -122,3 +122,53 @@ def check_seasons(start_season, end_season):
     if int(start_season[-4:]) > int(end_season[-4:]):
         raise ValueError("Invalid date range - "
                          "end_season earlier than start_season")
+
+
+def check_draft_arguments(pick_number, round_number=None, year=None):
+    """
+    Checks the draft pick, round and year are valid.
+
+    Arguments:
+        pick_number {int} -- the pick number, in the range [1,37].
+        round_number {int} -- the round number, in the range [1,24]
+            (default: {None}, i.e. every round).
+        year {int} -- the draft year, in the range [1963,2018]
+            (default: {None}, i.e. every year).
+
+    Raises:
+        TypeError: A message showing the incorrect argument type.
+        AssertionError: A message showing the argument out of range.
+    """
+    check_argument_type(pick_number, 'pick_number', int)
+    assert pick_number in range(1, 38), (
+        'Number of pick is out of avaliable range')
+    if round_number is not None:
+        check_argument_type(round_number, 'round_number', int)
+        assert round_number in range(1, 25), (
+            'Number of round is out of avaliable range')
+    if year is not None:
+        check_argument_type(year, 'year', int)
+        assert year in range(1963, 2019), 'Year is out if avaliable range'
+
+
+def check_attendance_seasons(start_season, end_season):
+    """
+    Checks the attendance seasons are valid, with the end_season
+    later than the start_season.
+
+    Arguments:
+        start_season {int} -- the start season, from 1975 to 2018.
+        end_season {int} -- the end season, from 1976 to 2019.
+
+    Raises:
+        Exception: A message showing the invalid season.
+    """
+    if start_season not in range(1975, 2019):
+        raise Exception('Start season is out of range')
+
+    if end_season not in range(1976, 2020):
+        raise Exception('End season is out of range')
+
+    if end_season <= start_season:
+        raise Exception('End season should be not be '
+                        'earlier than the start season')
@@ -0,0 +1,218 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This helper script is not designed to be used directly,
+rather it is a helper called by the pypuck module.
+
+Its purpose is to make the API requests for the pypuck module.
+Responses are requested compressed (gzip, and brotli when the optional
+brotli package is installed), and the ETag and Last-Modified
+validators of each response are replayed on the next request for the
+same URL. A 304 Not Modified response returns the previously parsed
+result without parsing it again.
+
+The bytes transferred, and saved by compression or by 304 responses,
+are recorded by the stats collector under 'http.*'.
+
+Requests are thread safe. All threads share one connection pool, and
+at most MAX_CONCURRENCY requests are in flight to each host at once;
+further requests block until a slot is free. Use set_max_concurrency
+to change the limit.
+
+Example:
+>>> from pypuck.helpers import http
+>>> df = http.get(url, parse_data)
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from pypuck.helpers import collector, helpers
+
+try:
+    import brotli  # noqa: F401 - lets urllib3 decode brotli responses
+    ACCEPT_ENCODING = 'br, gzip, deflate'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'br, gzip, deflate'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+# The number of (URL, parse function) pairs to keep validators and
+# parsed results for
+MAX_VALIDATORS = 64
+
+# The maximum number of concurrent requests to each host
+MAX_CONCURRENCY = 8
+
+# wire_size is the response body's size on the wire, i.e. the bytes a
+# 304 response saves
+Validator = namedtuple('Validator', ['etag', 'last_modified', 'parsed',
+                                     'wire_size'])
+
+_validators = OrderedDict()
+_validators_lock = threading.Lock()
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+
+def _new_session(max_concurrency):
+    """
+    Makes a session whose connection pools fit the concurrency limit.
+
+    Arguments:
+        max_concurrency {int} -- the maximum concurrent requests per host.
+
+    Returns:
+        requests.Session -- the session shared by all threads.
+    """
+    new_session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=max_concurrency)
+    new_session.mount('https://', adapter)
+    new_session.mount('http://', adapter)
+    return new_session
+
+
+session = _new_session(MAX_CONCURRENCY)
+
+
+def get(url, parse):
+    """
+    Requests a URL and parses its JSON response.
+
+    Arguments:
+        url {str} -- the URL to request.
+        parse {function} -- a function turning the decoded JSON into
+            the result (e.g. a dataframe). Stored results are kept per
+            URL and parse function, so it should be defined once
+            rather than be a new lambda for each call.
+
+    Raises:
+        ValueError: The API error response code and message.
+
+    Returns:
+        object -- the parsed result. Results with a copy method
+            (e.g. dataframes) are copied, so the stored result used
+            for 304 responses can't be modified.
+    """
+    headers = {'Accept-Encoding': ACCEPT_ENCODING}
+    with _validators_lock:
+        validator = _validators.get((url, parse))
+    if validator is not None:
+        if validator.etag is not None:
+            headers['If-None-Match'] = validator.etag
+        if validator.last_modified is not None:
+            headers['If-Modified-Since'] = validator.last_modified
+
+    with _host_slot(url):
+        response = session.get(url, headers=headers)
+    stats = collector.STATS
+    stats.increment('http.requests')
+
+    if response.status_code == 304 and validator is not None:
+        stats.increment('http.not_modified')
+        stats.increment('http.bytes_saved', validator.wire_size)
+        with _validators_lock:
+            _validators.move_to_end((url, parse), last=True)
+        return _copy(validator.parsed)
+
+    # Check the response code is valid - i.e. the API didn't fail
+    helpers.check_response_code(response.status_code)
+
+    decoded = len(response.content)
+    wire = _wire_size(response, decoded)
+    stats.increment('http.bytes_wire', wire)
+    stats.increment('http.bytes_decoded', decoded)
+    stats.increment('http.bytes_saved', max(decoded - wire, 0))
+
+    parsed = parse(response.json())
+
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag is not None or last_modified is not None:
+        with _validators_lock:
+            _validators[(url, parse)] = Validator(etag, last_modified,
+                                                  parsed, wire)
+            _validators.move_to_end((url, parse), last=True)
+            if len(_validators) > MAX_VALIDATORS:
+                _validators.popitem(last=False)
+    return _copy(parsed)
+
+
+def set_max_concurrency(max_concurrency):
+    """
+    Changes the maximum number of concurrent requests to each host.
+
+    Requests already in flight finish under the previous limit.
+
+    Arguments:
+        max_concurrency {int} -- the maximum concurrent requests per host.
+    """
+    global MAX_CONCURRENCY, session
+    helpers.check_argument_type(max_concurrency, 'max_concurrency', int)
+    if max_concurrency < 1:
+        raise ValueError("Invalid concurrency - must be at least 1")
+    with _host_slots_lock:
+        MAX_CONCURRENCY = max_concurrency
+        _host_slots.clear()
+        session = _new_session(max_concurrency)
+
+
+def clear():
+    """
+    Removes all the stored validators and parsed results.
+    """
+    with _validators_lock:
+        _validators.clear()
+
+
+def _host_slot(url):
+    """
+    Gets the semaphore bounding the concurrent requests to a URL's host.
+
+    Arguments:
+        url {str} -- the URL to request.
+
+    Returns:
+        threading.BoundedSemaphore -- the host's semaphore.
+    """
+    host = urlsplit(url).netloc
+    with _host_slots_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(MAX_CONCURRENCY)
+        return _host_slots[host]
+
+
+def _wire_size(response, decoded):
+    """
+    Gets the number of bytes a response body took on the wire.
+
+    Arguments:
+        response {requests.Response} -- the API response.
+        decoded {int} -- the decoded body size, used if the wire size
+            isn't known.
+
+    Returns:
+        int -- the (possibly compressed) body size.
+    """
+    try:
+        # urllib3 counts the raw bytes read from the connection
+        size = response.raw.tell()
+        if size:
+            return size
+    except (AttributeError, ValueError, OSError):
+        pass
+    length = response.headers.get('Content-Length')
+    return int(length) if length is not None else decoded
+
+
+def _copy(parsed):
+    """
+    Copies a parsed result if it can be copied.
+    """
+    return parsed.copy() if hasattr(parsed, 'copy') else parsed
@@ -0,0 +1,161 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This helper script is not designed to be used directly,
+rather it is a helper called by the pypuck module.
+
+Its purpose is to detect when the undocumented NHL.com APIs add or
+remove fields. A fingerprint of the fields returned by each endpoint
+is persisted in the pypuck data directory, and a SchemaDriftWarning is
+raised when a response's fields no longer match it, or don't include
+the columns requested from it. If the data directory can't be written
+the fingerprints are only kept for the session.
+
+Example:
+>>> from pypuck.helpers import schema
+>>> schema.check('team/summary', api['data'])
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import warnings
+
+from pypuck.helpers import storage
+
+FINGERPRINT_FILE = 'schema_fingerprints.json'
+
+_fingerprints = None
+_lock = threading.Lock()
+
+
+class SchemaDriftWarning(UserWarning):
+    """
+    Warns that an endpoint's fields changed since they were last seen.
+    """
+
+
+def fingerprint(fields):
+    """
+    Fingerprints a set of field names.
+
+    Arguments:
+        fields {iterable} -- the field names.
+
+    Returns:
+        str -- a hash of the sorted field names.
+    """
+    return hashlib.sha1('\n'.join(sorted(fields)).encode()).hexdigest()
+
+
+def check(endpoint, data, columns=None):
+    """
+    Checks an endpoint's records against its stored fingerprint.
+
+    The first response from an endpoint is stored as its fingerprint.
+    A later response with different fields raises a SchemaDriftWarning
+    listing the added and removed fields, and becomes the new
+    fingerprint. Requested columns missing from every record also raise
+    a SchemaDriftWarning, including on the first response. Responses
+    without records aren't checked.
+
+    Arguments:
+        endpoint {str} -- the endpoint name, e.g. 'team/summary'.
+        data {list} -- the decoded records.
+        columns {iterable} -- the columns requested from the records
+            (default: {None}, i.e. all of them).
+    """
+    if not data:
+        return
+    fields = set()
+    for record in data:
+        fields.update(record)
+    current = fingerprint(fields)
+
+    missing = sorted(set(columns or []).difference(fields))
+    if missing:
+        warnings.warn(f"The {endpoint} fields don't include the requested "
+                      f"columns {missing}", SchemaDriftWarning,
+                      stacklevel=_stacklevel())
+
+    with _lock:
+        fingerprints = _load()
+        previous = fingerprints.get(endpoint)
+        if previous is not None and previous['fingerprint'] == current:
+            return
+        fingerprints[endpoint] = {'fingerprint': current,
+                                  'fields': sorted(fields)}
+        _save(fingerprints)
+
+    if previous is not None:
+        added = sorted(fields.difference(previous['fields']))
+        removed = sorted(set(previous['fields']).difference(fields))
+        warnings.warn(f"The {endpoint} fields changed - added {added}, "
+                      f"removed {removed}", SchemaDriftWarning,
+                      stacklevel=_stacklevel())
+
+
+def reset():
+    """
+    Forgets the stored fingerprints, including the persisted ones.
+    """
+    global _fingerprints
+    with _lock:
+        _fingerprints = {}
+        _save(_fingerprints)
+
+
+def _load():
+    """
+    Loads the persisted fingerprints, once per session.
+
+    Returns:
+        dict -- the fingerprint and fields of each endpoint.
+    """
+    global _fingerprints
+    if _fingerprints is None:
+        try:
+            with open(storage.path(FINGERPRINT_FILE)) as f:
+                _fingerprints = json.load(f)
+        except (OSError, ValueError):
+            _fingerprints = {}
+    return _fingerprints
+
+
+def _save(fingerprints):
+    """
+    Persists the fingerprints, if the data directory can be written.
+
+    Arguments:
+        fingerprints {dict} -- the fingerprint and fields of each endpoint.
+    """
+    try:
+        path = storage.path(FINGERPRINT_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(fingerprints, f, indent=2)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        # e.g. a read-only home directory, the fingerprints are still
+        # kept in memory for the session
+        pass
+
+
+def _stacklevel():
+    """
+    Gets the stack level of the first caller outside pypuck, so that
+    warnings point at the call to the pypuck function.
+
+    Returns:
+        int -- the warnings.warn stack level, relative to the caller.
+    """
+    package = __name__.split('.')[0]
+    frame = sys._getframe(1)
+    level = 1
+    while (frame is not None and
+           frame.f_globals.get('__name__', '').split('.')[0] == package):
+        frame = frame.f_back
+        level += 1
+    return level
@@ -0,0 +1,52 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This helper script is not designed to be used directly,
+rather it is a helper called by the pypuck module.
+
+Its purpose is to locate the directory where pypuck persists
+data between sessions (e.g. the draft identity index). The directory
+defaults to ~/.pypuck and can be changed with the PYPUCK_DATA_DIR
+environment variable.
+
+Example:
+>>> from pypuck.helpers import storage
+>>> storage.path('draft_index.csv')
+"""
+
+import os
+
+
+def data_dir():
+    """
+    Gets the pypuck data directory, creating it if needed.
+
+    The directory is returned even if it can't be created (e.g. in a
+    read-only home directory), so callers see the error when they
+    open a file in it.
+
+    Returns:
+        str -- the data directory path.
+    """
+    directory = os.environ.get('PYPUCK_DATA_DIR',
+                               os.path.join(os.path.expanduser('~'),
+                                            '.pypuck'))
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        pass
+    return directory
+
+
+def path(name):
+    """
+    Gets the path of a file in the pypuck data directory.
+
+    Arguments:
+        name {str} -- the file name.
+
+    Returns:
+        str -- the file path.
+    """
+    return os.path.join(data_dir(), name)
@@ -0,0 +1,228 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+Link draft picks to NHL player ids, so that draft classes can be
+joined to player_stats without fuzzy merges on player names.
+
+The draft identity index maps a hash of each drafted player's
+normalized name and their draft year to their NHL playerId and birth
+date. It is built from the draft history and persisted in the pypuck
+data directory (see pypuck.helpers.storage), or only kept for the
+session if the data directory can't be written.
+
+Different players with the same normalized name and draft year are
+told apart by their birth date when the draft picks include it, and
+are otherwise left unlinked with a warning.
+
+Example:
+>>> from pypuck import pypuck, identity
+>>> draft = pypuck.draft_pick(pick_number=1, year=2010)
+>>> stats = pypuck.player_stats(start_date='2019-10-02',
+                                end_date='2020-02-28')
+>>> identity.join_draft_stats(draft, stats)
+"""
+
+import os
+import threading
+import warnings
+
+import pandas as pd
+from pypuck import pypuck
+from pypuck.helpers import storage
+
+INDEX_FILE = 'draft_index.csv'
+INDEX_COLUMNS = ['nameHash', 'draftYear', 'playerId', 'playerName',
+                 'birthDate']
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def normalize_names(names):
+    """
+    Normalize player names for matching.
+
+    Accents and punctuation are removed, and the names are lower cased
+    with single spaces, e.g. 'Jean-Sébastien  Giguère' becomes
+    'jeansebastien giguere'.
+
+    Parameters
+    ----------
+    names : pandas.core.Series
+      The player names.
+
+    Returns
+    -------
+    pandas.core.Series
+      The normalized names.
+    """
+    return (names.fillna('').astype(str)
+            .str.normalize('NFKD')
+            .str.encode('ascii', 'ignore').str.decode('ascii')
+            .str.lower()
+            .str.replace(r'[^a-z0-9 ]', '', regex=True)
+            .str.split().str.join(' '))
+
+
+def hash_names(names):
+    """
+    Hash normalized player names.
+
+    Parameters
+    ----------
+    names : pandas.core.Series
+      The player names.
+
+    Returns
+    -------
+    numpy.ndarray
+      A uint64 hash for each name.
+    """
+    return pd.util.hash_pandas_object(normalize_names(names),
+                                      index=False).to_numpy()
+
+
+def build_index(draft=None):
+    """
+    Build the draft identity index and persist it.
+
+    Parameters
+    ----------
+    draft : pandas.core.DataFrame (default None)
+      The full draft history. If None it is requested from the
+      NHL records API.
+
+    Returns
+    -------
+    pandas.core.DataFrame
+      The index, one row per drafted player with a known playerId.
+    """
+    global _index
+    if draft is None:
+        draft = pypuck._draft_data()
+    index = draft[draft.playerId.notnull()]
+    index = pd.DataFrame({
+        'nameHash': hash_names(index.playerName),
+        'draftYear': index.draftYear.to_numpy(),
+        'playerId': index.playerId.astype('int64').to_numpy(),
+        'playerName': index.playerName.to_numpy(),
+        'birthDate': (index.birthDate.to_numpy() if 'birthDate' in index
+                      else None)})
+    # The same player listed twice, rather than players sharing a name
+    index = index.drop_duplicates(['nameHash', 'draftYear', 'playerId'])
+
+    try:
+        path = storage.path(INDEX_FILE)
+        index.to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        # e.g. a read-only home directory, the index is still kept in
+        # memory for the session
+        pass
+    with _index_lock:
+        _index = index
+    return index
+
+
+def load_index(refresh=False):
+    """
+    Load the draft identity index, building it if it doesn't exist.
+
+    Parameters
+    ----------
+    refresh : boolean (default False)
+      Whether to rebuild the index from the draft history, e.g. to
+      pick up a new draft class.
+
+    Returns
+    -------
+    pandas.core.DataFrame
+      The index, one row per drafted player with a known playerId.
+    """
+    global _index
+    if refresh:
+        return build_index()
+    with _index_lock:
+        if _index is not None:
+            return _index
+    path = storage.path(INDEX_FILE)
+    if not os.path.exists(path):
+        return build_index()
+    index = pd.read_csv(path, dtype={'nameHash': 'uint64',
+                                     'birthDate': str})
+    with _index_lock:
+        _index = index
+    return index
+
+
+def join_draft_stats(draft, stats, index=None):
+    """
+    Attach player stats to draft picks.
+
+    The draft picks are matched to NHL playerIds through the identity
+    index (on the hashed normalized name and draft year, and the birth
+    date if the picks have a 'birthDate' column), and the stats are
+    attached with a single merge on playerId. Picks that never played,
+    or aren't in the stats, have empty stats columns. Picks matching
+    more than one player aren't linked, and raise a warning.
+
+    Parameters
+    ----------
+    draft : pandas.core.DataFrame
+      Draft picks with 'playerName' and 'draftYear' columns,
+      e.g. returned by draft_pick, and optionally 'birthDate'.
+    stats : pandas.core.DataFrame
+      Player stats with a 'playerId' column, e.g. returned by
+      player_stats.
+    index : pandas.core.DataFrame (default None)
+      The draft identity index. If None it is loaded with load_index.
+
+    Returns
+    -------
+    pandas.core.DataFrame
+      The draft picks with their 'playerId' and stats columns.
+
+    Examples
+    --------
+    >>> from pypuck import pypuck, identity
+    >>> draft = pypuck.draft_pick(pick_number=1, year=2010)
+    >>> stats = pypuck.player_stats(start_date='2019-10-02',
+                                    end_date='2020-02-28')
+    >>> identity.join_draft_stats(draft, stats)
+    playerName  | pickInRound | ... | playerId | points | ...
+    ----------------------------------------------------------
+    Tyler Seguin |      1      | ... | 8475794  |   50   | ...
+    ----------------------------------------------------------
+    """
+    for column in ['playerName', 'draftYear']:
+        if column not in draft.columns:
+            raise ValueError(f"Missing column {column} in draft")
+    if 'playerId' not in stats.columns:
+        raise ValueError("Missing column playerId in stats")
+    if index is None:
+        index = load_index()
+
+    on = ['nameHash', 'draftYear']
+    keys = pd.DataFrame({'nameHash': hash_names(draft.playerName),
+                         'draftYear': draft.draftYear.to_numpy()})
+    if 'birthDate' in draft.columns and 'birthDate' in index.columns:
+        on.append('birthDate')
+        keys['birthDate'] = draft.birthDate.astype(str).to_numpy()
+        index = index.assign(birthDate=index.birthDate.astype(str))
+
+    # Keys shared by different players can't be linked to either
+    index = index[on + ['playerId']].drop_duplicates()
+    shared = index.duplicated(on, keep=False)
+    ambiguous = keys.merge(index[shared][on].drop_duplicates(), on=on)
+    if len(ambiguous) > 0:
+        warnings.warn(f"{len(ambiguous)} draft picks share their name and "
+                      "draft year with another player and weren't linked, "
+                      "include a birthDate column to link them",
+                      stacklevel=2)
+    ids = keys.merge(index[~shared], how='left', on=on)
+    linked = draft.drop(columns=['playerId'], errors='ignore')
+    linked = linked.assign(playerId=ids.playerId.astype('Int64').to_numpy())
+    stats = stats.assign(playerId=stats.playerId.astype('Int64'))
+    return linked.merge(stats, how='left', on='playerId',
+                        suffixes=('', '_stats'))
@@ -0,0 +1,233 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+Derived metrics computed on top of the player_stats and team_stats
+dataframes.
+
+Each metric is a vectorized formula over whole columns, registered by
+name in METRICS. Computed metrics are memoized per (query, metric)
+along with the row index they were computed on, so repeated calls on
+the same query result reuse them while sorted or filtered frames
+derived from it are computed afresh.
+
+Example:
+>>> from pypuck import pypuck, metrics
+>>> df = pypuck.player_stats(start_date='2019-10-02', end_date='2020-02-28')
+>>> metrics.compute(df, ['points_per_60', 'shooting_pct_delta'])
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+Metric = namedtuple('Metric', ['function', 'columns'])
+
+# The registered metrics by name
+METRICS = {}
+
+# The row index and memoized metric values by (query key, fetch time,
+# metric name)
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+_MEMO_SIZE = 256
+
+
+def register(name, columns):
+    """
+    Register a derived metric.
+
+    The decorated function receives the dataframe and must return
+    a numpy array with one value per row, computed without row-wise
+    iteration.
+
+    Parameters
+    ----------
+    name : str
+      The metric name, also used as the output column name.
+    columns : list of str
+      The dataframe columns the metric needs.
+
+    Returns
+    -------
+    function
+      A decorator registering the metric function.
+
+    Examples
+    --------
+    >>> @metrics.register('goals_per_shot', ['goals', 'shots'])
+    ... def goals_per_shot(df):
+    ...     return metrics.divide(df['goals'], df['shots'])
+    """
+    def decorator(function):
+        METRICS[name] = Metric(function, list(columns))
+        return function
+    return decorator
+
+
+def divide(numerator, denominator):
+    """
+    Divide two columns, returning NaN where the denominator is zero.
+
+    Parameters
+    ----------
+    numerator : array-like
+      The numerator values.
+    denominator : array-like
+      The denominator values.
+
+    Returns
+    -------
+    numpy.ndarray
+      The element-wise quotient.
+    """
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+@register('points_per_60', ['points', 'timeOnIcePerGame', 'gamesPlayed'])
+def points_per_60(df):
+    """Points scored per 60 minutes of ice time."""
+    seconds = (np.asarray(df['timeOnIcePerGame'], dtype=float) *
+               np.asarray(df['gamesPlayed'], dtype=float))
+    return divide(np.asarray(df['points'], dtype=float) * 3600, seconds)
+
+
+@register('goals_per_game', ['goals', 'gamesPlayed'])
+def goals_per_game(df):
+    """Goals scored per game played."""
+    return divide(df['goals'], df['gamesPlayed'])
+
+
+@register('shooting_pct_delta', ['goals', 'shots'])
+def shooting_pct_delta(df):
+    """Shooting percentage minus the shot weighted average of the frame."""
+    goals = np.asarray(df['goals'], dtype=float)
+    shots = np.asarray(df['shots'], dtype=float)
+    return divide(goals, shots) - divide(goals.sum(), shots.sum())
+
+
+@register('goal_differential_per_game',
+          ['goalsFor', 'goalsAgainst', 'gamesPlayed'])
+def goal_differential_per_game(df):
+    """Goals for minus goals against, per game played."""
+    differential = (np.asarray(df['goalsFor'], dtype=float) -
+                    np.asarray(df['goalsAgainst'], dtype=float))
+    return divide(differential, df['gamesPlayed'])
+
+
+@register('points_pct', ['points', 'gamesPlayed'])
+def points_pct(df):
+    """Team points as a share of the maximum available points."""
+    return divide(df['points'], np.asarray(df['gamesPlayed']) * 2)
+
+
+def compute(df, metrics=None, key=None):
+    """
+    Compute derived metrics for a player_stats or team_stats dataframe.
+
+    The metrics are computed in one pass and added as new columns.
+    They are memoized by the query that produced the dataframe
+    (stored in df.attrs by pypuck), so repeated calls for the same
+    query result reuse them. Pandas copies attrs to sorted or filtered
+    frames, whose row index differs and so are computed again.
+
+    Parameters
+    ----------
+    df : pandas.core.DataFrame
+      A dataframe returned by player_stats or team_stats.
+    metrics : list of str (default None)
+      The metric names to compute. If None, every registered metric
+      whose columns are in the dataframe is computed.
+    key : hashable (default None)
+      The memoization key. Defaults to the query that produced the
+      dataframe; if the dataframe has no query the metrics aren't
+      memoized.
+
+    Returns
+    -------
+    pandas.core.DataFrame
+      A copy of the dataframe with a column for each metric.
+
+    Examples
+    --------
+    >>> from pypuck import pypuck, metrics
+    >>> df = pypuck.team_stats(start_season='19801981',
+                               end_season='19891990')
+    >>> metrics.compute(df, ['goal_differential_per_game'])
+    """
+    if metrics is None:
+        metrics = [name for name, metric in METRICS.items()
+                   if set(metric.columns).issubset(df.columns)]
+    for name in metrics:
+        if name not in METRICS:
+            raise ValueError(f"Unknown metric {name}")
+        missing = set(METRICS[name].columns).difference(df.columns)
+        if missing:
+            raise ValueError(f"Missing columns {sorted(missing)} "
+                             f"for metric {name}")
+
+    if key is None and 'query_key' in df.attrs:
+        key = (df.attrs['query_key'], df.attrs.get('fetched_at'))
+
+    values = {}
+    for name in metrics:
+        # Copy so changes to the result do not alter the memo
+        values[name] = _memoized(key, name, df).copy()
+    return df.assign(**values)
+
+
+def clear_memo():
+    """
+    Remove all the memoized metric values.
+    """
+    with _memo_lock:
+        _memo.clear()
+
+
+def _memoized(key, name, df):
+    """
+    Get a metric's values from the memo, computing them if needed.
+
+    Parameters
+    ----------
+    key : hashable
+      The memoization key, or None to skip the memo.
+    name : str
+      The metric name.
+    df : pandas.core.DataFrame
+      The dataframe the metric is computed on.
+
+    Returns
+    -------
+    pandas.core.Series
+      The metric values, aligned on the dataframe's index.
+    """
+    if key is None:
+        return _evaluate(name, df)
+    memo_key = (key, name)
+    with _memo_lock:
+        entry = _memo.get(memo_key)
+        # Comparing the row index is much cheaper than the metric itself
+        if entry is not None and entry[0].equals(df.index):
+            _memo.move_to_end(memo_key)
+            return entry[1]
+    values = _evaluate(name, df)
+    with _memo_lock:
+        _memo[memo_key] = (df.index, values)
+        _memo.move_to_end(memo_key)
+        if len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+    return values
+
+
+def _evaluate(name, df):
+    """
+    Compute a metric, aligning its values on the dataframe's index.
+    """
+    return pd.Series(METRICS[name].function(df), index=df.index, name=name)
@@ -4,15 +4,52 @@
 """
 The pypuck functions are used as wrapper functions to call the NHL.com
 publicly available API's.
+
+The pypuck functions are thread safe and can be called concurrently,
+e.g. from the worker threads of a web server. The caches they share
+are protected by locks, the HTTP connection pool is shared by all
+threads, and at most http.MAX_CONCURRENCY requests are sent to each
+host at once; further requests wait for a free slot.
 """
 
-import requests
+import functools
+import threading
+import time
+from collections import OrderedDict
 import pandas as pd
 import altair as alt
-from pypuck.helpers import helpers
-
-
-def player_stats(start_date=None, end_date=None):
+from pypuck.helpers import helpers, caching, http, schema
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+# The base URLs of the NHL.com APIs
+STATS_API = 'https://api.nhle.com/stats/rest/en'
+RECORDS_API = 'https://records.nhl.com/site/api'
+
+# The columns returned by draft_pick
+DRAFT_COLUMNS = ['playerName', 'pickInRound', 'roundNumber', 'triCode',
+                 'draftYear']
+
+# The server filtered draft picks already requested, by their filters,
+# least recently used first (see _draft_data). At most DRAFT_CACHE_SIZE
+# queries are kept, each for DRAFT_CACHE_TTL seconds.
+DRAFT_CACHE_SIZE = 64
+DRAFT_CACHE_TTL = 3600
+_draft_cache = OrderedDict()
+_draft_lock = threading.Lock()
+
+# The stale-while-revalidate cache used by player_stats and team_stats
+# when called with cache=True. Its soft_ttl, hard_ttl and max_entries can
+# be adjusted.
+live_cache = caching.SWRCache(soft_ttl=300, hard_ttl=1800)
+
+
+def player_stats(start_date=None, end_date=None, cache=False,
+                 output='pandas', columns=None):
     """
     Query the top 100 player's stats (sorted by total points)
     from the players summary report endpoint on the NHL.com API.
@@ -37,10 +74,25 @@ def player_stats(start_date=None, end_date=None):
       The stat start date string in 'YYYY-MM-DD' format.
     end_date : str (default None)
       The stat end date string in 'YYYY-MM-DD' format.
+    cache : boolean (default False)
+      Whether to serve the stats from the stale-while-revalidate cache
+      (pypuck.live_cache). A cached result is returned immediately and
+      refreshed in the background once it is older than the soft TTL.
+      The result's staleness in seconds is stored in df.attrs['staleness'].
+    output : str (default 'pandas')
+      The result type, 'pandas' for a pandas.DataFrame or 'arrow' for a
+      pyarrow.Table built directly from the decoded JSON (requires
+      pyarrow). Call the table's to_pandas method to convert it.
+    columns : list of str (default None)
+      The columns to keep, e.g. ['playerId', 'skaterFullName', 'points'].
+      The other fields are dropped while decoding the response, before
+      the result is built. A SchemaDriftWarning is raised when the
+      endpoint's fields change or don't include a requested column,
+      so a projection can't silently lose renamed fields.
 
     Returns
     -------
-    pandas.core.DataFrame
+    pandas.core.DataFrame or pyarrow.Table
       The player's stats in a dataframe sorted by total points.
 
     Examples
@@ -64,9 +116,40 @@ def player_stats(start_date=None, end_date=None):
     helpers.check_date_format(start_date)
     helpers.check_date_format(end_date)
     helpers.check_date(start_date, end_date)
+    helpers.check_argument_type(cache, 'cache', bool)
+    _check_output(output)
+    columns = _check_columns(columns)
+
+    if cache is True:
+        return _from_cache(('player_stats', start_date, end_date, output,
+                            columns),
+                           _player_stats_data, start_date, end_date, output,
+                           columns)
+    return _player_stats_data(start_date, end_date, output, columns)
+
+
+def _player_stats_data(start_date, end_date, output='pandas', columns=None):
+    """
+    Request the top 100 player's stats for a validated date range.
 
+    Parameters
+    ----------
+    start_date : str
+      The stat start date string in 'YYYY-MM-DD' format.
+    end_date : str
+      The stat end date string in 'YYYY-MM-DD' format.
+    output : str (default 'pandas')
+      The result type, 'pandas' or 'arrow'.
+    columns : tuple of str (default None)
+      The columns to keep, or None for all of them.
+
+    Returns
+    -------
+    pandas.core.DataFrame or pyarrow.Table
+      The player's stats in a dataframe sorted by total points.
+    """
     # Specify the URL
-    url = 'https://api.nhle.com/stats/rest/en/skater/summary?' +\
+    url = f'{STATS_API}/skater/summary?' +\
           'isAggregate=true&' +\
           'isGame=true&' +\
           'sort=[{"property":"points","direction":"DESC"},' +\
@@ -79,17 +162,18 @@ def player_stats(start_date=None, end_date=None):
           f'gameDate>="{start_date}" and gameTypeId=2'
 
     # Make the API request
-    page = requests.get(url)
+    df = http.get(url, _parser('skater/summary', output, columns))
+    if output == 'arrow':
+        return df
 
-    # Check the response code is valid - i.e. the API didn't fail
-    helpers.check_response_code(page.status_code)
-
-    # Return the top 100 players dataframe
-    return pd.DataFrame(page.json()['data'])
+    # Return the top 100 players dataframe, tagged with its query
+    _tag_query(df, ('player_stats', start_date, end_date, columns))
+    return df
 
 
 def attendance(regular=True, playoffs=True,
-               start_season=None, end_season=None):
+               start_season=None, end_season=None,
+               compact=False, data_file=None, output='chart'):
     """
     Query the NHL attendance number from 1975 to 2019 from the NHL records API.
     The attendance represents annual attendance numbers for all teams.
@@ -111,10 +195,25 @@ def attendance(regular=True, playoffs=True,
       The start season is integer ranging from 1975 to 2018.
     end_season : int (default None)
       The end season is integer ranging from 1976 to 2019.
+    compact : boolean (default False)
+      Whether to embed a single copy of the attendance data in the chart.
+      When both regular and playoffs are requested the two series are
+      drawn from one shared dataset with a fold transform, instead of
+      two side by side charts that each inline their own copy.
+    data_file : str (default None)
+      A path to write the attendance data to as JSON. The chart will
+      reference the data by this path (as a URL) instead of inlining it,
+      so it should be relative to where the chart is rendered.
+    output : str (default 'chart')
+      The result type, 'chart' for an Altair chart, 'pandas' for the
+      seasonId and selected attendance columns of the selected seasons
+      in a pandas.DataFrame, or 'arrow' for them in a pyarrow.Table
+      built directly from the decoded JSON (requires pyarrow). compact
+      and data_file only apply to charts.
 
     Returns
     -------
-    altair.vegalite.v3.api.Chart
+    altair.vegalite.v3.api.Chart, pandas.core.DataFrame or pyarrow.Table
       It wil display attendance numbers in an Altair chart.
 
     Examples
@@ -123,24 +222,17 @@ def attendance(regular=True, playoffs=True,
     >>> pypuck.attendance(regular=True, playoffs=True,
                           start_season=2000, end_season=2019)
     ...
+    >>> pypuck.attendance(start_season=2000, end_season=2019,
+                          compact=True, data_file='attendance.json')
+    ...
     """
 
-    # Specify the URL
-    url = 'https://records.nhl.com/site/api/attendance'
-
-    # Make the API request
-    page = requests.get(url)
-
-    # Check the response code is valid - i.e. the API didn't fail
-    helpers.check_response_code(page.status_code)
-
-    df = pd.DataFrame(page.json()['data']).sort_values(by=['seasonId'])
-
-    df = df.fillna(0)
-    df.playoffAttendance = df.playoffAttendance.astype(int)
-    df.regularAttendance = df.regularAttendance.astype(int)
-    df = df.rename(columns={'regularAttendance': 'regular',
-                            'playoffAttendance': 'playoff'})
+    helpers.check_argument_type(output, 'output', str)
+    if output not in ['chart', 'pandas', 'arrow']:
+        raise ValueError(f"Invalid output {output}, "
+                         "requires 'chart', 'pandas' or 'arrow'")
+    if output == 'arrow':
+        _check_output(output)
 
     # set start season and end season to default value if none
     if pd.isnull(start_season):
@@ -152,38 +244,66 @@ def attendance(regular=True, playoffs=True,
     # check if a proper input is given
     helpers.check_argument_type(regular, 'regular', bool)
     helpers.check_argument_type(playoffs, 'playoffs', bool)
+    helpers.check_argument_type(compact, 'compact', bool)
+    if data_file is not None:
+        helpers.check_argument_type(data_file, 'data_file', str)
+    if regular is False and playoffs is False:
+        raise Exception('Must select at least one attendance type')
+    if output != 'chart' and (compact is True or data_file is not None):
+        raise ValueError("compact and data_file require output='chart'")
 
-    if start_season not in range(1975, 2019):
-        raise Exception('Start season is out of range')
-
-    if end_season not in range(1976, 2020):
-        raise Exception('End season is out of range')
-
-    if end_season <= start_season:
-        raise Exception('End season should be not be '
-                        'earlier than the start season')
+    helpers.check_attendance_seasons(start_season, end_season)
 
     start_season = int(str(start_season) + str(start_season))
     end_season = int(str(end_season) + str(end_season))
+    df = _attendance_data('arrow' if output == 'arrow' else 'pandas')
+    columns = (['seasonId'] + (['regular'] if regular else []) +
+               (['playoff'] if playoffs else []))
+    if output == 'arrow':
+        return df.filter(pc.and_(
+            pc.greater_equal(df['seasonId'], start_season),
+            pc.less_equal(df['seasonId'], end_season))).select(columns)
     df = df.query('seasonId >= @start_season and seasonId <= @end_season')
-
-    if regular is True and playoffs is True:
+    if output == 'pandas':
+        return df[columns].reset_index(drop=True)
+
+    # Only keep the columns the charts encode when the payload is shared
+    if compact is True or data_file is not None:
+        df = df[['seasonId', 'regular', 'playoff']]
+
+    # Reference the data by URL rather than inlining it in the chart
+    data = df
+    if data_file is not None:
+        df.to_json(data_file, orient='records')
+        data = alt.UrlData(url=data_file,
+                           format=alt.DataFormat(type='json'))
+
+    if regular is True and playoffs is True and compact is True:
+        # plot both attendance types from one shared dataset
+        plot = alt.Chart(data).transform_fold(
+            ['regular', 'playoff'], as_=['type', 'attendance']
+        ).mark_bar().encode(
+            alt.X('seasonId:N', title="Season"),
+            alt.Y('attendance:Q', title='Attendance'),
+            alt.Column('type:N', title='Attendance Type')
+        ).resolve_scale(y='independent')
+    elif regular is True and playoffs is True:
         # plot both regular attendance and playoff attendance
-        plot1 = alt.Chart(df, title="Regular Attendance").mark_bar().encode(
+        plot1 = alt.Chart(data, title="Regular Attendance").mark_bar().encode(
             alt.X('seasonId:N', title="Season"),
             alt.Y('regular:Q', title='Regular Attendance'))
-        plot2 = alt.Chart(df, title="Playoff Attendance").mark_bar().encode(
+        plot2 = alt.Chart(data, title="Playoff Attendance").mark_bar().encode(
             alt.X('seasonId:N', title="Season"),
             alt.Y('playoff:Q', title='Playoff Attendance'))
         plot = (plot1 | plot2)
     elif regular is True:
         # plot regular attendance if it is requested only
-        plot = alt.Chart(df, title="Regular Attendance").mark_bar().encode(
+        plot = alt.Chart(data, title="Regular Attendance").mark_bar().encode(
             alt.X('seasonId:N', title="Season"),
             alt.Y('regular:Q', title='Regular Attendance'))
     elif playoffs is True:
         # plot playoff attendance if it is requested only
-        plot = alt.Chart(df, title="Playoff Attendance").mark_bar().encode(
+        plot = alt.Chart(data, title="Playoff Attendance").mark_bar().encode(
             alt.X('seasonId:N', title="Season"),
             alt.Y('playoff:Q', title='Playoff Attendance'))
     else:
@@ -191,7 +311,81 @@ def attendance(regular=True, playoffs=True,
     return plot
 
 
-def team_stats(start_season="20192020", end_season="20192020"):
+def _attendance_data(output='pandas'):
+    """
+    Request the seasonal attendance numbers from the NHL records API.
+
+    Parameters
+    ----------
+    output : str (default 'pandas')
+      The result type, 'pandas' or 'arrow'.
+
+    Returns
+    -------
+    pandas.core.DataFrame or pyarrow.Table
+      The attendance by seasonId, with the 'regular' and 'playoff'
+      attendance as integers.
+    """
+    # Specify the URL
+    url = f'{RECORDS_API}/attendance'
+
+    # Make the API request
+    if output == 'arrow':
+        return http.get(url, _attendance_table)
+    return http.get(url, _attendance_frame)
+
+
+def _attendance_frame(api):
+    """
+    Parse the attendance API response.
+
+    Parameters
+    ----------
+    api : dict
+      The decoded JSON response.
+
+    Returns
+    -------
+    pandas.core.DataFrame
+      The attendance by seasonId, with the 'regular' and 'playoff'
+      attendance as integers.
+    """
+    df = pd.DataFrame(api['data']).sort_values(by=['seasonId'])
+
+    df = df.fillna(0)
+    df.playoffAttendance = df.playoffAttendance.astype(int)
+    df.regularAttendance = df.regularAttendance.astype(int)
+    df = df.rename(columns={'regularAttendance': 'regular',
+                            'playoffAttendance': 'playoff'})
+    return df
+
+
+def _attendance_table(api):
+    """
+    Parse the attendance API response into an Arrow table.
+
+    Parameters
+    ----------
+    api : dict
+      The decoded JSON response.
+
+    Returns
+    -------
+    pyarrow.Table
+      The attendance by seasonId, with the 'regular' and 'playoff'
+      attendance as integers.
+    """
+    table = _arrow_table(api)
+    for column, name in [('regularAttendance', 'regular'),
+                         ('playoffAttendance', 'playoff')]:
+        position = table.schema.get_field_index(column)
+        values = pc.fill_null(table[column].cast(pa.int64()), 0)
+        table = table.set_column(position, name, values)
+    return table.sort_by('seasonId')
+
+
+def team_stats(start_season="20192020", end_season="20192020", cache=False,
+               output='pandas', columns=None):
     """
     Get team season stats specified by start year or start year and end year.
     If no year is specified then the year 2019-2020 is default.
@@ -210,10 +404,26 @@ def team_stats(start_season="20192020", end_season="20192020"):
         The stat start year string in 'YYYYYYYY' format.
       end_season : str
         The stat end year string in 'YYYYYYYY' format.
+      cache : boolean (default False)
+        Whether to serve the stats from the stale-while-revalidate cache
+        (pypuck.live_cache). A cached result is returned immediately and
+        refreshed in the background once it is older than the soft TTL.
+        The result's staleness in seconds is stored in
+        df.attrs['staleness'].
+      output : str (default 'pandas')
+        The result type, 'pandas' for a pandas.DataFrame or 'arrow' for
+        a pyarrow.Table built directly from the decoded JSON (requires
+        pyarrow). Call the table's to_pandas method to convert it.
+      columns : list of str (default None)
+        The columns to keep, e.g. ['teamId', 'seasonId', 'points'].
+        The other fields are dropped while decoding the response, before
+        the result is built. A SchemaDriftWarning is raised when the
+        endpoint's fields change or don't include a requested column,
+        so a projection can't silently lose renamed fields.
 
     Returns
     -------
-    pandas.core.DataFrame
+    pandas.core.DataFrame or pyarrow.Table
       The team's seasonal stats in a dataframe.
 
     Examples
@@ -234,24 +444,241 @@ def team_stats(start_season="20192020", end_season="20192020"):
     helpers.check_season_format(start_season)
     helpers.check_season_format(end_season)
     helpers.check_seasons(start_season, end_season)
+    helpers.check_argument_type(cache, 'cache', bool)
+    _check_output(output)
+    columns = _check_columns(columns)
+
+    if cache is True:
+        return _from_cache(('team_stats', start_season, end_season, output,
+                            columns),
+                           _team_stats_data, start_season, end_season,
+                           output, columns)
+    return _team_stats_data(start_season, end_season, output, columns)
 
-    base_url = 'https://api.nhle.com/stats/rest/en/team/summary?'
+
+def _team_stats_data(start_season, end_season, output='pandas',
+                     columns=None):
+    """
+    Request the team season stats for a validated season range.
+
+    Parameters
+    ----------
+      start_season : str
+        The stat start year string in 'YYYYYYYY' format.
+      end_season : str
+        The stat end year string in 'YYYYYYYY' format.
+      output : str (default 'pandas')
+        The result type, 'pandas' or 'arrow'.
+      columns : tuple of str (default None)
+        The columns to keep, or None for all of them.
+
+    Returns
+    -------
+    pandas.core.DataFrame or pyarrow.Table
+      The team's seasonal stats in a dataframe.
+    """
+    base_url = f'{STATS_API}/team/summary?'
     arguments = 'cayenneExp=gameTypeId=2' +\
                 f' and seasonId<={end_season}' +\
                 f' and seasonId>={start_season}'
 
     # Make the api request
-    page = requests.get(base_url + arguments)
+    df = http.get(base_url + arguments,
+                  _parser('team/summary', output, columns))
+    if output == 'arrow':
+        return df
+    _tag_query(df, ('team_stats', start_season, end_season, columns))
+
+    return df
+
+
+def _data_frame(api):
+    """
+    Parse an API response's data into a dataframe.
+
+    Parameters
+    ----------
+    api : dict
+      The decoded JSON response.
+
+    Returns
+    -------
+    pandas.core.DataFrame
+      The response data, one row per record.
+    """
+    return pd.DataFrame(api['data'])
+
+
+def _arrow_table(api):
+    """
+    Parse an API response's data into an Arrow table, without
+    building a dataframe first.
+
+    Parameters
+    ----------
+    api : dict
+      The decoded JSON response.
+
+    Returns
+    -------
+    pyarrow.Table
+      The response data, one row per record.
+    """
+    return pa.Table.from_pylist(api['data'])
+
+
+def _empty_table(columns):
+    """
+    Make an Arrow table without rows, with null typed columns.
+
+    Parameters
+    ----------
+    columns : list of str
+      The column names.
+
+    Returns
+    -------
+    pyarrow.Table
+      The empty table.
+    """
+    return pa.Table.from_pylist(
+        [], schema=pa.schema([(column, pa.null()) for column in columns]))
+
+
+@functools.lru_cache(maxsize=None)
+def _parser(endpoint, output, columns):
+    """
+    Make a parser for a stats endpoint's responses.
 
-    # Check the response code is valid - i.e. the API didn't fail
-    helpers.check_response_code(page.status_code)
+    The parser checks the response fields for schema drift and for
+    requested columns the response doesn't include, keeps only the
+    requested columns, and builds the result from the remaining
+    fields. Parsers are cached so the http helper can match a response
+    with the result it previously parsed.
 
-    df = pd.DataFrame(page.json()['data'])
+    Parameters
+    ----------
+    endpoint : str
+      The endpoint name used for the schema fingerprint.
+    output : str
+      The result type, 'pandas' or 'arrow'.
+    columns : tuple of str
+      The columns to keep, or None for all of them.
+
+    Returns
+    -------
+    function
+      The parser of the decoded JSON response.
+    """
+    def parse(api):
+        data = api['data']
+        schema.check(endpoint, data, columns)
+        if columns is not None:
+            data = [{column: record.get(column) for column in columns}
+                    for record in data]
+        if output == 'arrow':
+            if not data and columns is not None:
+                # Keep the requested columns, as the dataframe does
+                return _empty_table(columns)
+            return _arrow_table({'data': data})
+        df = pd.DataFrame(data, columns=columns)
+        # Responses replayed for a 304 keep the time they were parsed
+        df.attrs['fetched_at'] = time.time()
+        return df
+    return parse
+
+
+def _check_columns(columns):
+    """
+    Check a column projection.
+
+    Parameters
+    ----------
+    columns : list of str
+      The columns to keep, or None for all of them.
+
+    Returns
+    -------
+    tuple of str
+      The columns, or None for all of them.
+    """
+    if columns is None:
+        return None
+    helpers.check_argument_type(columns, 'columns', (list, tuple))
+    for column in columns:
+        helpers.check_argument_type(column, 'column', str)
+    return tuple(columns)
 
+
+def _check_output(output):
+    """
+    Check that a result type is supported.
+
+    Parameters
+    ----------
+    output : str
+      The result type, 'pandas' or 'arrow'.
+    """
+    helpers.check_argument_type(output, 'output', str)
+    if output not in ['pandas', 'arrow']:
+        raise ValueError(f"Invalid output {output}, "
+                         "requires 'pandas' or 'arrow'")
+    if output == 'arrow' and pa is None:
+        raise ImportError("output='arrow' requires pyarrow, "
+                          "install it with pip install pyarrow")
+
+
+def _tag_query(df, key):
+    """
+    Record which query produced a dataframe, and when its data was
+    fetched, if the parser didn't already record it.
+
+    The tags are used to memoize results computed from the dataframe,
+    such as the derived metrics in pypuck.metrics. A response that
+    wasn't modified since it was last parsed keeps its fetch time, so
+    the results computed from it are reused.
+
+    Parameters
+    ----------
+    df : pandas.core.DataFrame
+      The dataframe returned by the query.
+    key : tuple
+      The query key, i.e. the function name and its arguments.
+    """
+    df.attrs['query_key'] = key
+    df.attrs.setdefault('fetched_at', time.time())
+
+
+def _from_cache(key, fetch, *args):
+    """
+    Serve a query from the stale-while-revalidate cache.
+
+    Parameters
+    ----------
+    key : tuple
+      The query key, i.e. the function name and its arguments.
+    fetch : function
+      The function requesting fresh data for the query.
+    *args
+      The arguments passed to fetch.
+
+    Returns
+    -------
+    pandas.core.DataFrame or pyarrow.Table
+      A copy of the cached dataframe, with its staleness in seconds
+      stored in df.attrs['staleness']. Arrow tables are immutable and
+      returned as is.
+    """
+    df, staleness = live_cache.get(key, lambda: fetch(*args))
+    if isinstance(df, pd.DataFrame):
+        # Copy so callers can't modify the cached dataframe
+        df = df.copy()
+        df.attrs['staleness'] = staleness
     return df
 
 
-def draft_pick(pick_number=1, round_number=None, year=None):
+def draft_pick(pick_number=1, round_number=None, year=None,
+               server_filter=False, output='pandas', allow_empty=False):
     """
     The function returns information about draft picks for the specified
     parameters and stores them in a pandas data frame.
@@ -276,10 +703,23 @@ def draft_pick(pick_number=1, round_number=None, year=None):
     year : int (default None).
       Year in which a draft took place. Must be YYYY format,
       that contains year in a range [1963,2019].
+    server_filter : boolean (default False).
+      Whether to filter the draft picks on the NHL records API instead
+      of downloading the full draft history. Server filtered queries
+      are cached for DRAFT_CACHE_TTL seconds, and a query covered by a
+      cached broader query is filtered locally instead. Call
+      clear_draft_cache to request them again.
+    output : str (default 'pandas').
+      The result type, 'pandas' for a pandas.DataFrame or 'arrow' for a
+      pyarrow.Table built directly from the decoded JSON (requires
+      pyarrow). Call the table's to_pandas method to convert it.
+    allow_empty : boolean (default False).
+      Whether to return an empty result, rather than raise an assert
+      error, when no pick matches the parameters.
 
     Returns
     -------
-    pandas.core.DataFrame
+    pandas.core.DataFrame or pyarrow.Table
       Drafts with specified parameters.
 
     Examples
@@ -296,34 +736,194 @@ def draft_pick(pick_number=1, round_number=None, year=None):
     Tim Eriksson      |     7     |    9     |   LAK    | 2000 | ...
     ------------------------------------------------
     """
-    # Check that the arguments are of the correct type (i.e. int) and value
-    helpers.check_argument_type(pick_number, 'pick_number', int)
-    assert pick_number in range(1, 38), (
-        'Number of pick is out of avaliable range')
-    if round_number is not None:
-        helpers.check_argument_type(round_number, 'round_number', int)
-        assert round_number in range(1, 25), (
-            'Number of round is out of avaliable range')
-    if year is not None:
-        helpers.check_argument_type(year, 'year', int)
-        assert year in range(1963, 2019), 'Year is out if avaliable range'
-
-    api = requests.get("https://records.nhl.com/site/api/draft").json()
-    stats = pd.DataFrame(api['data'])
-
-    if round_number and year:
-        query = "pickInRound == @pick_number and " +\
-                "roundNumber == @round_number and draftYear == @year"
-    elif round_number:
-        query = "pickInRound == @pick_number and roundNumber == @round_number"
-    elif year:
-        query = "pickInRound == @pick_number and draftYear == @year"
+    helpers.check_draft_arguments(pick_number, round_number, year)
+    helpers.check_argument_type(server_filter, 'server_filter', bool)
+    helpers.check_argument_type(allow_empty, 'allow_empty', bool)
+    _check_output(output)
+
+    filters = {'pickInRound': pick_number}
+    if round_number:
+        filters['roundNumber'] = round_number
+    if year:
+        filters['draftYear'] = year
+
+    # Only download (and cache) the matching picks if filtering on the
+    # server, otherwise request the full draft history
+    if server_filter is True:
+        stats = _draft_data(filters, output, cache=True)
     else:
-        query = "pickInRound == @pick_number"
+        stats = _draft_data(None, output)
 
-    df = stats.query(query)[['playerName', 'pickInRound',
-                             'roundNumber', 'triCode', 'draftYear']]
+    df = _filter_draft(stats, filters)
+    if output == 'arrow':
+        df = df.select(DRAFT_COLUMNS)
+    else:
+        df = df[DRAFT_COLUMNS]
     # Checking if output is valid
-    assert df.empty is False, (
+    assert allow_empty or len(df) > 0, (
         'Specified pick number didn`t exist in specified round or year')
     return df
+
+
+def _draft_data(filters=None, output='pandas', cache=False):
+    """
+    Request draft picks from the NHL records API.
+
+    The filters are sent to the API as a cayenneExp, so only the
+    matching picks are downloaded. Cached results are kept in a least
+    recently used cache, and a query covered by a broader cached query
+    is filtered locally instead of being requested.
+
+    Parameters
+    ----------
+    filters : dict (default None)
+      The required value of each filtered column, e.g.
+      {'draftYear': 2000, 'roundNumber': 2}. If None the full draft
+      history is returned.
+    output : str (default 'pandas')
+      The result type, 'pandas' or 'arrow'.
+    cache : boolean (default False)
+      Whether to serve the picks from, and store them in, the cache.
+
+    Returns
+    -------
+    pandas.core.DataFrame or pyarrow.Table
+      The matching draft picks, with all the columns returned by the API
+      and at least the DRAFT_COLUMNS if no picks match.
+    """
+    filters = {} if filters is None else filters
+    key = (output, frozenset(filters.items()))
+    if cache:
+        cached = _cached_draft(key, filters)
+        if cached is not None:
+            return cached
+
+    url = f'{RECORDS_API}/draft'
+    if filters:
+        url += '?cayenneExp=' + ' and '.join(
+            f'{column}={value}' for column, value in sorted(filters.items()))
+    # The API filter is reapplied in case it ignored a predicate
+    parse = _draft_table if output == 'arrow' else _draft_frame
+    df = _filter_draft(http.get(url, parse), filters)
+    if cache:
+        with _draft_lock:
+            _draft_cache[key] = (df, time.monotonic())
+            _draft_cache.move_to_end(key)
+            while len(_draft_cache) > DRAFT_CACHE_SIZE:
+                _draft_cache.popitem(last=False)
+    return df
+
+
+def _cached_draft(key, filters):
+    """
+    Look for a draft query, or a broader one, in the cache.
+
+    Parameters
+    ----------
+    key : tuple
+      The query's result type and filters.
+    filters : dict
+      The required value of each filtered column.
+
+    Returns
+    -------
+    pandas.core.DataFrame or pyarrow.Table
+      The matching draft picks, or None if the query isn't cached.
+    """
+    now = time.monotonic()
+    with _draft_lock:
+        for cached_key, (df, fetched_at) in list(_draft_cache.items()):
+            if now - fetched_at >= DRAFT_CACHE_TTL:
+                del _draft_cache[cached_key]
+        if key in _draft_cache:
+            _draft_cache.move_to_end(key)
+            return _draft_cache[key][0]
+        for cached_key, (df, _) in reversed(_draft_cache.items()):
+            if cached_key[0] == key[0] and cached_key[1] <= key[1]:
+                _draft_cache.move_to_end(cached_key)
+                return _filter_draft(df, filters)
+    return None
+
+
+def clear_draft_cache():
+    """
+    Remove the cached server filtered draft picks, so that
+    draft_pick requests them again.
+
+    Examples
+    --------
+    >>> from pypuck import pypuck
+    >>> pypuck.clear_draft_cache()
+    """
+    with _draft_lock:
+        _draft_cache.clear()
+
+
+def _draft_frame(api):
+    """
+    Parse a draft response's data into a dataframe, keeping the
+    DRAFT_COLUMNS when no picks match.
+
+    Parameters
+    ----------
+    api : dict
+      The decoded JSON response.
+
+    Returns
+    -------
+    pandas.core.DataFrame
+      The draft picks, one row per pick.
+    """
+    if not api['data']:
+        return pd.DataFrame(columns=DRAFT_COLUMNS)
+    return _data_frame(api)
+
+
+def _draft_table(api):
+    """
+    Parse a draft response's data into an Arrow table, keeping the
+    DRAFT_COLUMNS when no picks match.
+
+    Parameters
+    ----------
+    api : dict
+      The decoded JSON response.
+
+    Returns
+    -------
+    pyarrow.Table
+      The draft picks, one row per pick.
+    """
+    if not api['data']:
+        return _empty_table(DRAFT_COLUMNS)
+    return _arrow_table(api)
+
+
+def _filter_draft(df, filters):
+    """
+    Filter draft picks locally.
+
+    Parameters
+    ----------
+    df : pandas.core.DataFrame or pyarrow.Table
+      The draft picks.
+    filters : dict
+      The required value of each filtered column.
+
+    Returns
+    -------
+    pandas.core.DataFrame or pyarrow.Table
+      The matching draft picks.
+    """
+    if not filters or len(df) == 0:
+        return df
+    if isinstance(df, pd.DataFrame):
+        mask = True
+        for column, value in filters.items():
+            mask = mask & (df[column] == value)
+        return df[mask]
+    mask = None
+    for column, value in filters.items():
+        equal = pc.equal(df[column], value)
+        mask = equal if mask is None else pc.and_(mask, equal)
+    return df.filter(mask)
@@ -0,0 +1,150 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This script tests the stale-while-revalidate cache in the helpers module.
+"""
+
+import threading
+import time
+
+import pytest
+
+from pypuck.helpers import caching, collector
+
+
+def counting_fetch(calls, delay=0):
+    """
+    Make a fetch function that returns how many times it was called.
+
+    Arguments:
+        calls {list} -- a list the fetch function appends to.
+        delay {float} -- seconds each fetch takes (default: {0}).
+    """
+    def fetch():
+        time.sleep(delay)
+        calls.append(1)
+        return len(calls)
+    return fetch
+
+
+def join_refreshes():
+    """
+    Wait for the background refresh threads to finish.
+    """
+    for thread in threading.enumerate():
+        if thread is not threading.current_thread():
+            thread.join(1)
+
+
+def test_cache_fresh_and_stale():
+    """
+    Test that fresh values are served from the cache and that stale
+    values are served immediately while refreshed in the background.
+    """
+    stats = collector.StatsCollector()
+    cache = caching.SWRCache(soft_ttl=0.05, hard_ttl=10, stats=stats)
+    calls = []
+    fetch = counting_fetch(calls)
+
+    assert cache.get('key', fetch) == (1, 0.0)
+    value, staleness = cache.get('key', fetch)
+    assert value == 1 and len(calls) == 1, "A fresh value should be reused"
+
+    # Past the soft TTL the stale value is served without blocking
+    time.sleep(0.06)
+    slow_fetch = counting_fetch(calls, delay=0.2)
+    start = time.monotonic()
+    value, staleness = cache.get('key', slow_fetch)
+    assert time.monotonic() - start < 0.1, "A stale value shouldn't block"
+    assert value == 1 and staleness >= 0.05
+
+    # The background refresh replaces the stale value
+    join_refreshes()
+    value, staleness = cache.get('key', fetch)
+    assert value == 2 and staleness < 0.05
+
+    summary = stats.summary()
+    assert summary['cache.miss'] == 1 and summary['cache.refresh'] == 1
+    assert summary['cache.staleness']['count'] == 4
+
+
+def test_cache_hard_ttl():
+    """
+    Test that values past the hard TTL are refetched by the caller and
+    that a failing background refresh keeps serving the stale value.
+    """
+    stats = collector.StatsCollector()
+    cache = caching.SWRCache(soft_ttl=0, hard_ttl=0.1, stats=stats)
+    calls = []
+    fetch = counting_fetch(calls)
+    cache.get('key', fetch)
+
+    def failing_fetch():
+        raise ValueError("Response 503 - Service Unavailable")
+
+    assert cache.get('key', failing_fetch)[0] == 1
+    join_refreshes()
+    assert stats.summary()['cache.refresh_error'] == 1
+
+    time.sleep(0.1)
+    assert cache.get('key', fetch) == (2, 0.0)
+
+
+def test_cache_bad_ttl():
+    """
+    Test that the soft TTL can't be greater than the hard TTL.
+    """
+    with pytest.raises(ValueError) as e:
+        caching.SWRCache(soft_ttl=10, hard_ttl=1)
+    assert str(e.value) == "Invalid TTLs - soft_ttl greater than hard_ttl"
+
+
+def test_cache_fetch_locks():
+    """
+    Test that concurrent misses wait for a single fetch and that the
+    per key fetch locks are removed once the fetches finish.
+    """
+    cache = caching.SWRCache(stats=collector.StatsCollector())
+    calls = []
+    fetch = counting_fetch(calls, delay=0.05)
+    threads = [threading.Thread(target=cache.get, args=('key', fetch))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1, "Concurrent misses should fetch once"
+
+    def failing_fetch():
+        raise ValueError("Response 503 - Service Unavailable")
+
+    for key in range(100):
+        cache.get(key, counting_fetch(calls))
+    with pytest.raises(ValueError):
+        cache.get('other', failing_fetch)
+    assert cache._fetch_locks == {}
+
+
+def test_cache_eviction():
+    """
+    Test that the least recently used values are evicted and that
+    values past the hard TTL are dropped.
+    """
+    cache = caching.SWRCache(soft_ttl=0.05, hard_ttl=0.05, max_entries=2,
+                             stats=collector.StatsCollector())
+    calls = []
+    fetch = counting_fetch(calls)
+    cache.get('a', fetch)
+    cache.get('b', fetch)
+    cache.get('a', fetch)
+    cache.get('c', fetch)
+    assert list(cache._entries) == ['a', 'c']
+
+    time.sleep(0.06)
+    assert cache._usable('a') is None
+    assert list(cache._entries) == ['c']
+
+    with pytest.raises(ValueError) as e:
+        caching.SWRCache(max_entries=0)
+    assert str(e.value) == "Invalid size - max_entries must be at least 1"
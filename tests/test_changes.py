@@ -0,0 +1,110 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This script tests the snapshot diffs in the changes module.
+"""
+
+import pandas as pd
+import pytest
+
+from pypuck import changes
+from pypuck.helpers import schema
+
+
+def team_frame(points):
+    """
+    Make a dataframe shaped like the team_stats output.
+    """
+    return pd.DataFrame({'teamId': list(range(1, len(points) + 1)),
+                         'seasonId': [20192020] * len(points),
+                         'points': points})
+
+
+def test_diff():
+    """
+    Test that inserted, updated and deleted rows are found.
+    """
+    store = changes.SnapshotStore()
+    key = changes.PRIMARY_KEYS['team_stats']
+
+    delta = store.diff('teams', team_frame([80, 70, 60]), key)
+    assert len(delta.inserted) == 3, "The first snapshot is all inserts"
+    assert delta.updated.empty and delta.deleted.empty
+
+    delta = store.diff('teams', team_frame([80, 72, 60]), key)
+    assert delta.inserted.empty and delta.deleted.empty
+    assert list(delta.updated.teamId) == [2]
+    assert list(delta.updated.points) == [72]
+
+    # Team 1 is gone, team 4 is new and team 3 was updated
+    df = team_frame([0, 72, 62, 50]).iloc[1:]
+    delta = store.diff('teams', df, key)
+    assert list(delta.inserted.teamId) == [4]
+    assert list(delta.updated.teamId) == [3]
+    assert list(delta.deleted.points) == [80]
+
+    # Previewing a delta keeps the previous snapshot
+    df = team_frame([0, 72, 62, 55]).iloc[1:]
+    assert len(store.diff('teams', df, key, update=False).updated) == 1
+    assert len(store.diff('teams', df, key).updated) == 1
+    assert store.diff('teams', df, key).updated.empty
+
+    # Rows added to a snapshot that had no rows
+    store.diff('empty', team_frame([]), key)
+    assert len(store.diff('empty', team_frame([1]), key).inserted) == 1
+
+
+def test_diff_columns():
+    """
+    Test that column order, numeric dtype changes and added or removed
+    columns don't make every row updated.
+    """
+    store = changes.SnapshotStore()
+    key = changes.PRIMARY_KEYS['team_stats']
+    store.diff('teams', team_frame([80, 70, 60]).assign(
+        faceoffWinPct=[1.0, float('nan'), 0.0]), key)
+
+    # Filling the null makes the column int64, and the columns reordered
+    df = team_frame([80, 70, 60]).assign(faceoffWinPct=[1, 0, 0])
+    delta = store.diff('teams', df.iloc[:, ::-1], key)
+    assert list(delta.updated.teamId) == [2]
+    assert not delta.added_columns and not delta.removed_columns
+
+    # Only the changed rows of the shared columns are updated
+    df = team_frame([80, 71, 60]).assign(wins=[40, 30, 20])
+    delta = store.diff('teams', df, key)
+    assert list(delta.updated.teamId) == [2]
+    assert delta.added_columns == ['wins']
+    assert delta.removed_columns == ['faceoffWinPct']
+
+
+def test_diff_bad():
+    """
+    Test that invalid primary keys raise errors.
+    """
+    store = changes.SnapshotStore()
+    with pytest.raises(ValueError) as e:
+        store.diff('teams', team_frame([1]), ['playerId'])
+    assert str(e.value) == "Missing primary key columns ['playerId']"
+
+    with pytest.raises(ValueError) as e:
+        store.diff('teams', team_frame([1, 2]), ['seasonId'])
+    assert str(e.value) == "Duplicate primary key values in ['seasonId']"
+
+
+def test_team_stats_changes(tmp_path, monkeypatch):
+    """
+    Test that an unchanged team_stats poll returns an empty delta.
+    """
+    # Persist the schema fingerprints to a temporary data directory
+    monkeypatch.setenv('PYPUCK_DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(schema, '_fingerprints', None)
+    store = changes.SnapshotStore()
+    delta = changes.team_stats_changes(start_season='19531954',
+                                       end_season='19581959', store=store)
+    assert len(delta.inserted) == 36
+    delta = changes.team_stats_changes(start_season='19531954',
+                                       end_season='19581959', store=store)
+    assert delta.inserted.empty and delta.updated.empty
+    assert delta.deleted.empty
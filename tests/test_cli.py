@@ -0,0 +1,192 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This script tests the pypuck command line exporter.
+"""
+
+import json
+import os
+import re
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import pytest
+import requests
+
+from pypuck import cli, pypuck
+from pypuck.helpers import http
+
+
+def fake_team_stats(start_season, end_season):
+    """
+    Stand in for team_stats, returning two teams for a season.
+    """
+    if start_season == '19901991' and fake_team_stats.fail:
+        raise ValueError("Response 503 - Service Unavailable")
+    return pd.DataFrame({'teamId': [1, 2],
+                         'seasonId': [int(start_season)] * 2,
+                         'points': [90, 80]})
+
+
+@pytest.fixture
+def team_stats(monkeypatch):
+    """
+    Replace team_stats so the exporter doesn't call the API.
+    """
+    fake_team_stats.fail = False
+    monkeypatch.setattr(pypuck, 'team_stats', fake_team_stats)
+    return fake_team_stats
+
+
+@pytest.mark.parametrize('output_format', ['csv', 'ndjson'])
+def test_export(tmp_path, team_stats, output_format):
+    """
+    Test that every season chunk is written to the output.
+    """
+    output = str(tmp_path / f'teams.{output_format}')
+    code = cli.main(['export', 'team_stats', '--start', '19801981',
+                     '--end', '19891990', '--format', output_format,
+                     '--output', output, '--workers', '3'])
+    assert code == 0
+    if output_format == 'csv':
+        df = pd.read_csv(output)
+    else:
+        df = pd.read_json(output, lines=True)
+    assert len(df) == 20 and df.seasonId.nunique() == 10
+    assert not os.path.exists(output + '.progress'), (
+        "The progress file should be removed once the export is complete")
+
+    # An existing output is not overwritten
+    code = cli.main(['export', 'team_stats', '--output', output,
+                     '--format', output_format])
+    assert code == 1
+
+
+def test_export_resume(tmp_path, team_stats):
+    """
+    Test that an interrupted export keeps its written chunks and
+    resumes without writing duplicate or partial rows.
+    """
+    output = str(tmp_path / 'teams.csv')
+    args = ['export', 'team_stats', '--start', '19851986',
+            '--end', '19941995', '--output', output, '--workers', '1']
+    team_stats.fail = True
+    assert cli.main(args) == 1
+    with open(output + '.progress') as f:
+        assert json.loads(f.readline())['arguments']['start'] == '19851986'
+        written = [json.loads(line)['chunk'] for line in f]
+    assert '19901991' not in written and len(written) > 0
+
+    # Simulate a chunk interrupted half way through being written
+    with open(output, 'a') as f:
+        f.write('3,1990')
+
+    team_stats.fail = False
+    # Resuming with different arguments would mix two exports
+    code = cli.main(args[:5] + ['19951996'] + args[6:] + ['--resume'])
+    assert code == 1
+
+    assert cli.main(args + ['--resume']) == 0
+    df = pd.read_csv(output)
+    assert len(df) == 20 and not df.duplicated().any()
+    assert list(df.seasonId.unique()) == [
+        int(f'{year}{year + 1}') for year in range(1985, 1995)]
+
+
+def test_export_order(tmp_path, monkeypatch):
+    """
+    Test that chunks finishing out of order are written in chunk order.
+    """
+    def slow_team_stats(start_season, end_season):
+        # The earlier seasons finish last
+        time.sleep((1990 - int(start_season[:4])) * 0.01)
+        return fake_team_stats(start_season, end_season)
+
+    fake_team_stats.fail = False
+    monkeypatch.setattr(pypuck, 'team_stats', slow_team_stats)
+    output = str(tmp_path / 'teams.ndjson')
+    code = cli.main(['export', 'team_stats', '--start', '19801981',
+                     '--end', '19891990', '--format', 'ndjson',
+                     '--output', output, '--workers', '4'])
+    assert code == 0
+    df = pd.read_json(output, lines=True)
+    assert list(df.seasonId) == [int(f'{year}{year + 1}')
+                                 for year in range(1980, 1990)
+                                 for team in range(2)]
+
+
+def test_export_bad(tmp_path, capsys):
+    """
+    Test that invalid export arguments are reported.
+    """
+    output = str(tmp_path / 'teams.csv')
+    code = cli.main(['export', 'team_stats', '--start', '20192020',
+                     '--end', '20182019', '--output', output])
+    assert code == 1
+    assert capsys.readouterr().err == (
+        "pypuck: error: Invalid date range - "
+        "end_season earlier than start_season\n")
+
+    code = cli.main(['export', 'team_stats', '--output', output,
+                     '--resume'])
+    assert code == 1
+    assert not os.path.exists(output)
+    capsys.readouterr()
+
+    code = cli.main(['export', 'team_stats', '--output', output,
+                     '--workers', '0'])
+    assert code == 1
+    assert capsys.readouterr().err == (
+        "pypuck: error: Invalid workers - workers must be at least 1\n")
+    assert not os.path.exists(output)
+    assert not os.path.exists(output + '.progress')
+
+
+class DraftSession:
+    """
+    Stand in for the records API, with ten picks per round from 1964.
+    """
+
+    def get(self, url, headers=None):
+        query = parse_qs(urlsplit(url).query).get('cayenneExp', [''])[0]
+        filters = dict(re.findall(r'(\w+)=(\d+)', query))
+        picks = [{'playerName': f'Player {year}-{pick}', 'pickInRound': pick,
+                  'roundNumber': 1, 'triCode': 'VAN', 'draftYear': year}
+                 for year in range(1963, 1966)
+                 for pick in range(1, 11 if year > 1963 else 6)]
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({'data': [
+            pick for pick in picks
+            if all(pick[k] == int(v) for k, v in filters.items())]}).encode()
+        return response
+
+
+def test_export_draft_pick(tmp_path, monkeypatch, capsys):
+    """
+    Test that draft years without the pick are exported as empty chunks
+    and that the draft_pick arguments are checked.
+    """
+    monkeypatch.setattr(http, 'session', DraftSession())
+    pypuck.clear_draft_cache()
+    output = str(tmp_path / 'picks.csv')
+    code = cli.main(['export', 'draft_pick', '--start', '1963',
+                     '--end', '1965', '--pick', '10', '--output', output])
+    assert code == 0
+    df = pd.read_csv(output)
+    assert list(df.columns) == pypuck.DRAFT_COLUMNS
+    assert list(df.draftYear) == [1964, 1965]
+
+    code = cli.main(['export', 'draft_pick', '--pick', '40',
+                     '--output', str(tmp_path / 'bad.csv')])
+    assert code == 1
+    assert capsys.readouterr().err.endswith(
+        "pypuck: error: Number of pick is out of avaliable range\n")
+
+    code = cli.main(['export', 'draft_pick', '--start', '1950',
+                     '--output', str(tmp_path / 'bad.csv')])
+    assert code == 1
+    assert capsys.readouterr().err == (
+        "pypuck: error: Year is out if avaliable range\n")
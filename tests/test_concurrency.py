@@ -0,0 +1,130 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This script stress tests the pypuck functions from many threads
+against a local stand-in for the NHL.com APIs.
+"""
+
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from pypuck import pypuck
+from pypuck.helpers import http, schema
+
+DRAFT = [{'playerName': f'Player {year}-{round_}-{pick}',
+          'pickInRound': pick, 'roundNumber': round_, 'triCode': 'VAN',
+          'draftYear': year}
+         for year in range(1963, 2019)
+         for round_ in range(1, 8)
+         for pick in range(1, 11)]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Answers the team summary and draft requests, recording how many
+    requests are in flight at once.
+    """
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight,
+                                       server.in_flight)
+        try:
+            # Simulate the API's response time
+            time.sleep(0.005)
+            parts = urlsplit(self.path)
+            query = parse_qs(parts.query).get('cayenneExp', [''])[0]
+            if parts.path.endswith('/team/summary'):
+                seasons = [int(s) for s in re.findall(r'seasonId[<>]=(\d+)',
+                                                      query)]
+                data = [{'teamId': team, 'seasonId': season}
+                        for season in range(min(seasons), max(seasons) + 1,
+                                            10001)
+                        for team in range(1, 4)]
+            else:
+                filters = dict(re.findall(r'(\w+)=(\d+)', query))
+                data = [row for row in DRAFT
+                        if all(row[k] == int(v) for k, v in filters.items())]
+            body = json.dumps({'data': data}).encode()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """
+    Start the stand-in server and point pypuck at it, with the schema
+    fingerprints persisted to a temporary data directory.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.in_flight = server.max_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    url = f'http://127.0.0.1:{server.server_port}'
+    monkeypatch.setattr(pypuck, 'STATS_API', url + '/stats/rest/en')
+    monkeypatch.setattr(pypuck, 'RECORDS_API', url + '/site/api')
+    monkeypatch.setenv('PYPUCK_DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(schema, '_fingerprints', None)
+    http.clear()
+    pypuck.clear_draft_cache()
+    yield server
+    server.shutdown()
+    server.server_close()
+    http.set_max_concurrency(8)
+
+
+def test_concurrent_calls(server):
+    """
+    Test that team_stats and draft_pick return correct results when
+    called from 32 threads, without exceeding the per host limit.
+    """
+    http.set_max_concurrency(4)
+
+    def call(i):
+        if i % 2 == 0:
+            year = 1960 + i % 40
+            df = pypuck.team_stats(f'{year}{year + 1}',
+                                   f'{year + 2}{year + 3}')
+            return len(df) == 9 and df.seasonId.min() == int(
+                f'{year}{year + 1}')
+        year = 1963 + i % 50
+        df = pypuck.draft_pick(pick_number=1 + i % 10, year=year,
+                               server_filter=True)
+        return (len(df) == 7 and (df.draftYear == year).all() and
+                (df.pickInRound == 1 + i % 10).all())
+
+    calls = 640
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(call, range(calls)))
+    elapsed = time.monotonic() - start
+
+    assert all(results), "A concurrent call returned the wrong rows"
+    assert server.max_in_flight <= 4, (
+        f"{server.max_in_flight} requests were in flight at once")
+    # Cached draft queries mean fewer requests than calls, at least
+    # four at a time; the bound is loose to allow for slow machines
+    assert calls / elapsed > 20, (
+        f"Only {calls / elapsed:.0f} calls per second")
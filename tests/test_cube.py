@@ -0,0 +1,123 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This script tests the team_stats aggregate cube in the cube module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pypuck import cube, pypuck
+
+
+def fake_team_stats(start_season, end_season):
+    """
+    Stand in for team_stats, with team 3 missing the first season
+    and the 2004-2005 season missing altogether.
+    """
+    rows = []
+    for year in range(int(start_season[:4]), int(end_season[:4]) + 1):
+        if year == 2004:
+            continue
+        for team in [1, 2, 3]:
+            if team == 3 and year == 2000:
+                continue
+            rows.append({'teamId': team, 'teamFullName': f'Team {team}',
+                         'seasonId': int(f'{year}{year + 1}'),
+                         'gamesPlayed': 82,
+                         'goalsFor': 200 + team + fake_team_stats.bump,
+                         'points': year - 1900})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def teams(tmp_path, monkeypatch):
+    """
+    A cube of the 2000-2001 to 2009-2010 seasons, persisted to a
+    temporary data directory.
+    """
+    monkeypatch.setenv('PYPUCK_DATA_DIR', str(tmp_path))
+    fake_team_stats.bump = 0
+    monkeypatch.setattr(pypuck, 'team_stats', fake_team_stats)
+    return cube.TeamStatsCube.build('20002001', '20092010')
+
+
+def test_totals_and_means(teams):
+    """
+    Test that the season range aggregates match a direct groupby.
+    """
+    df = fake_team_stats('20002001', '20092010')
+    for start, end in [('20002001', '20092010'), ('20032004', '20052006'),
+                       ('19901991', '20002001'), ('20042005', '20042005')]:
+        rows = df[df.seasonId.between(int(start), int(end))]
+        expected = rows.groupby('teamId')[['goalsFor', 'points']]
+        totals = teams.totals(start, end).set_index('teamId')
+        means = teams.means(start, end).set_index('teamId')
+        assert np.allclose(totals[['goalsFor', 'points']],
+                           expected.sum())
+        assert np.allclose(means[['goalsFor', 'points']], expected.mean())
+        assert list(totals.seasons) == list(expected.size())
+
+    totals = teams.totals('20002001', '20092010')
+    assert list(totals.seasons) == [9, 9, 8]
+    assert list(totals.teamFullName) == ['Team 1', 'Team 2', 'Team 3']
+
+
+def test_refresh(teams):
+    """
+    Test that refreshing a season updates the aggregates after it,
+    and that a new season is added.
+    """
+    fake_team_stats.bump = 10
+    teams.refresh()
+    totals = teams.totals('20002001', '20092010').set_index('teamId')
+    assert list(totals.goalsFor) == [201 * 8 + 211, 202 * 8 + 212,
+                                     203 * 7 + 213]
+    assert teams.totals('20002001', '20082009').goalsFor[0] == 201 * 8
+
+    teams.refresh('20102011')
+    assert teams.seasons[-1] == 20102011
+    assert teams.totals('20102011', '20102011').goalsFor[0] == 211
+
+    # The refreshed cube was persisted
+    loaded = cube.TeamStatsCube.load()
+    assert loaded.totals('20002001', '20102011').equals(
+        teams.totals('20002001', '20102011'))
+
+
+def test_totals_bad(teams):
+    """
+    Test that invalid season ranges raise errors.
+    """
+    with pytest.raises(Exception) as e:
+        teams.totals('20092010', '20002001')
+    assert str(e.value) == ("Invalid date range - "
+                            "end_season earlier than start_season")
+
+
+def test_missing_stats(tmp_path, monkeypatch):
+    """
+    Test that missing stats count as zero in totals and that means
+    only average the seasons where they were recorded.
+    """
+    df = pd.DataFrame({'teamId': [1, 1, 2, 2],
+                       'seasonId': [19981999, 19992000] * 2,
+                       'faceoffWinPct': [np.nan, 0.55, np.nan, np.nan]})
+    teams = cube.TeamStatsCube(df)
+    totals = teams.totals('19981999', '19992000')
+    means = teams.means('19981999', '19992000')
+    assert list(totals.faceoffWinPct) == [0.55, 0]
+    assert means.faceoffWinPct[0] == 0.55
+    assert np.isnan(means.faceoffWinPct[1])
+
+    # A refreshed season records the stat
+    monkeypatch.setenv('PYPUCK_DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(pypuck, 'team_stats', lambda start, end:
+                        pd.DataFrame({'teamId': [1, 2],
+                                      'seasonId': [19981999] * 2,
+                                      'faceoffWinPct': [0.45, 0.5]}))
+    teams.refresh('19981999', save=False)
+    means = teams.means('19981999', '19992000')
+    assert np.allclose(means.faceoffWinPct, [0.5, 0.5])
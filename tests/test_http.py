@@ -0,0 +1,101 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This script tests the compressed and conditional requests made by
+the http helper.
+"""
+
+import json
+
+import pandas as pd
+import pytest
+import requests
+
+from pypuck.helpers import collector, http
+
+
+class FakeServer:
+    """
+    Stand in for the API, answering with an ETag and gzip sizes.
+    """
+
+    def __init__(self):
+        self.body = json.dumps({'data': [{'teamId': 1, 'points': 90}]})
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(headers)
+        response = requests.Response()
+        etag = f'"{hash(self.body)}"'
+        response.headers['ETag'] = etag
+        if headers.get('If-None-Match') == etag:
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = 200
+            response._content = self.body.encode()
+            response.headers['Content-Length'] = '20'
+        return response
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """
+    Replace the http session with a fake server and reset the stats.
+    """
+    fake = FakeServer()
+    monkeypatch.setattr(http, 'session', fake)
+    http.clear()
+    collector.STATS.reset()
+    return fake
+
+
+def test_conditional_get(server):
+    """
+    Test that validators are replayed and that a 304 response returns
+    the previously parsed result without parsing it again.
+    """
+    parsed = []
+
+    def parse(api):
+        parsed.append(1)
+        return pd.DataFrame(api['data'])
+
+    df = http.get('https://api/teams', parse)
+    assert 'gzip' in server.requests[0]['Accept-Encoding']
+    assert 'If-None-Match' not in server.requests[0]
+
+    # Changing the result does not change the stored result
+    df['points'] = 0
+    df = http.get('https://api/teams', parse)
+    assert server.requests[1]['If-None-Match'] is not None
+    assert len(parsed) == 1, "A 304 response shouldn't be parsed"
+    assert list(df.points) == [90]
+
+    server.body = json.dumps({'data': [{'teamId': 1, 'points': 92}]})
+    assert list(http.get('https://api/teams', parse).points) == [92]
+
+    stats = collector.STATS.summary()
+    assert stats['http.requests'] == 3
+    assert stats['http.not_modified'] == 1
+    assert stats['http.bytes_wire'] == 40
+    # Compression saved the decoded size less the wire size twice, and
+    # the 304 response saved the first response's wire size
+    decoded = len(server.body)
+    assert stats['http.bytes_saved'] == 2 * (decoded - 20) + 20
+
+
+def test_get_bad(server, monkeypatch):
+    """
+    Test that API errors are raised.
+    """
+    def unavailable(url, headers=None):
+        response = requests.Response()
+        response.status_code = 503
+        return response
+
+    monkeypatch.setattr(server, 'get', unavailable)
+    with pytest.raises(ValueError) as e:
+        http.get('https://api/teams', dict)
+    assert str(e.value) == "Response 503 - Service Unavailable"
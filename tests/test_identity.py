@@ -0,0 +1,114 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This script tests the draft identity index in the identity module.
+"""
+
+import pandas as pd
+import pytest
+
+from pypuck import identity
+
+
+@pytest.fixture
+def draft(tmp_path, monkeypatch):
+    """
+    A small draft history, with the index persisted to a temporary
+    data directory.
+    """
+    monkeypatch.setenv('PYPUCK_DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(identity, '_index', None)
+    return pd.DataFrame({
+        'playerName': ['Jean-Sébastien Giguère', 'Tyler Seguin',
+                       'Tyler Seguin', 'Never Played'],
+        'draftYear': [1995, 2010, 1990, 2010],
+        'pickInRound': [13, 2, 5, 20],
+        'roundNumber': [1, 1, 3, 1],
+        'triCode': ['HFD', 'BOS', 'MTL', 'VAN'],
+        'playerId': [8460000, 8475794, 8440000, None],
+        'birthDate': ['1977-05-16', '1992-01-31', '1972-01-01',
+                      '1992-01-01']})
+
+
+def test_normalize_names():
+    """
+    Test that accents, punctuation, case and spacing are normalized.
+    """
+    names = pd.Series(['Jean-Sébastien  Giguère', "Ryan O'Reilly", None])
+    assert list(identity.normalize_names(names)) == [
+        'jeansebastien giguere', 'ryan oreilly', '']
+
+
+def test_join_draft_stats(draft):
+    """
+    Test that draft picks are linked to their own player's stats,
+    even when another drafted player has the same name.
+    """
+    index = identity.build_index(draft)
+    assert len(index) == 3, "Players without a playerId aren't indexed"
+
+    stats = pd.DataFrame({'playerId': [8475794, 8460000],
+                          'skaterFullName': ['Tyler Seguin', 'J. Giguere'],
+                          'points': [50, 3]})
+    picks = draft[['playerName', 'pickInRound', 'roundNumber', 'triCode',
+                   'draftYear']]
+    df = identity.join_draft_stats(picks, stats)
+    assert list(df.points.fillna(-1)) == [3, 50, -1, -1]
+    assert df.playerId.isnull().sum() == 1
+
+    # The index is persisted and reloaded from the data directory
+    identity._index = None
+    reloaded = identity.load_index()
+    assert reloaded.nameHash.equals(index.nameHash.reset_index(drop=True))
+    df = identity.join_draft_stats(picks, stats, index=reloaded)
+    assert list(df.points.fillna(-1)) == [3, 50, -1, -1]
+
+
+def test_join_draft_stats_bad(draft):
+    """
+    Test that missing join columns raise errors.
+    """
+    with pytest.raises(ValueError) as e:
+        identity.join_draft_stats(draft.drop(columns=['draftYear']),
+                                  pd.DataFrame({'playerId': []}))
+    assert str(e.value) == "Missing column draftYear in draft"
+
+
+def test_join_draft_stats_shared_name(draft):
+    """
+    Test that different players with the same name and draft year
+    are only linked when the picks include their birth dates.
+    """
+    draft = pd.concat([draft, pd.DataFrame({
+        'playerName': ['Tyler Seguin'], 'draftYear': [2010],
+        'pickInRound': [30], 'roundNumber': [7], 'triCode': ['MTL'],
+        'playerId': [8479999], 'birthDate': ['1991-06-01']})],
+        ignore_index=True)
+    index = identity.build_index(draft)
+    stats = pd.DataFrame({'playerId': [8475794, 8479999],
+                          'points': [50, 1]})
+
+    picks = draft.drop(columns=['playerId', 'birthDate'])
+    with pytest.warns(UserWarning) as record:
+        df = identity.join_draft_stats(picks, stats, index=index)
+    assert str(record[0].message).startswith("2 draft picks share")
+    assert df.playerId.isnull().sum() == 3
+
+    df = identity.join_draft_stats(draft.drop(columns=['playerId']), stats,
+                                   index=index)
+    assert list(df.points.fillna(-1)) == [-1, 50, -1, -1, 1]
+
+
+def test_read_only_index(draft, tmp_path, monkeypatch):
+    """
+    Test that the index is kept in memory when the data directory
+    can't be written.
+    """
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    monkeypatch.setenv('PYPUCK_DATA_DIR', str(blocker / 'pypuck'))
+    identity.build_index(draft)
+    stats = pd.DataFrame({'playerId': [8475794], 'points': [50]})
+    df = identity.join_draft_stats(draft.drop(columns=['playerId']), stats)
+    assert list(df.points.fillna(-1)) == [-1, 50, -1, -1]
@@ -0,0 +1,169 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This script tests the derived metrics in the metrics module.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+from pypuck import metrics, pypuck
+from pypuck.helpers import http, schema
+
+
+def player_frame():
+    """
+    Make a small dataframe shaped like the player_stats output.
+    """
+    df = pd.DataFrame({'playerId': [1, 2, 3],
+                       'points': [60, 30, 0],
+                       'goals': [20, 10, 0],
+                       'shots': [100, 100, 0],
+                       'gamesPlayed': [60, 60, 0],
+                       'timeOnIcePerGame': [1200.0, 900.0, 0.0]})
+    df.attrs['query_key'] = ('player_stats', '2019-10-02', '2020-02-28')
+    df.attrs['fetched_at'] = 0
+    return df
+
+
+def test_player_metrics():
+    """
+    Test that the player metrics are computed correctly and that
+    zero denominators give NaN rather than an error.
+    """
+    metrics.clear_memo()
+    df = metrics.compute(player_frame(),
+                         ['points_per_60', 'shooting_pct_delta'])
+    assert np.allclose(df['points_per_60'][:2], [3.0, 2.0])
+    assert np.isnan(df['points_per_60'][2])
+    assert np.allclose(df['shooting_pct_delta'][:2], [0.05, -0.05])
+
+
+def test_team_metrics():
+    """
+    Test that all the applicable metrics are computed by default.
+    """
+    df = pd.DataFrame({'teamId': [1, 2], 'gamesPlayed': [82, 82],
+                       'goalsFor': [250, 200], 'goalsAgainst': [209, 241],
+                       'points': [100, 82]})
+    df = metrics.compute(df)
+    assert np.allclose(df['goal_differential_per_game'], [0.5, -0.5])
+    assert np.allclose(df['points_pct'], [100 / 164, 0.5])
+    assert 'points_per_60' not in df.columns
+
+
+def test_metrics_memo():
+    """
+    Test that metrics are memoized per query and metric.
+    """
+    metrics.clear_memo()
+    calls = []
+
+    @metrics.register('test_metric', ['points'])
+    def test_metric(df):
+        calls.append(1)
+        return np.asarray(df['points'], dtype=float)
+
+    try:
+        df = player_frame()
+        metrics.compute(df, ['test_metric'])
+        result = metrics.compute(df, ['test_metric'])
+        assert len(calls) == 1, "The metric should be memoized"
+
+        # Changing the result does not change the memo
+        result.loc[0, 'test_metric'] = -1
+        assert metrics.compute(df, ['test_metric'])['test_metric'][0] == 60
+
+        # A refreshed query result is computed again
+        df.attrs['fetched_at'] = 1
+        metrics.compute(df, ['test_metric'])
+        assert len(calls) == 2, "A new fetch should not use the memo"
+    finally:
+        del metrics.METRICS['test_metric']
+
+
+def test_metrics_bad():
+    """
+    Test that unknown metrics and missing columns raise errors.
+    """
+    with pytest.raises(ValueError) as e:
+        metrics.compute(player_frame(), ['not_a_metric'])
+    assert str(e.value) == "Unknown metric not_a_metric"
+
+    with pytest.raises(ValueError) as e:
+        metrics.compute(player_frame(), ['goal_differential_per_game'])
+    assert str(e.value) == ("Missing columns ['goalsAgainst', 'goalsFor'] "
+                            "for metric goal_differential_per_game")
+
+
+def test_metrics_sorted_and_filtered():
+    """
+    Test that frames sorted or filtered from a memoized query result,
+    which keep its attrs, get their own rows' metrics.
+    """
+    metrics.clear_memo()
+    df = player_frame()
+    metrics.compute(df, ['goals_per_game', 'shooting_pct_delta'])
+
+    ordered = metrics.compute(df.sort_values('points'), ['goals_per_game'])
+    assert list(ordered.index) == [2, 1, 0]
+    assert np.isnan(ordered.loc[2, 'goals_per_game'])
+    assert np.allclose(ordered.loc[[1, 0], 'goals_per_game'], [1 / 6, 1 / 3])
+
+    subset = df[df['playerId'] != 2]
+    subset = metrics.compute(subset, ['goals_per_game', 'shooting_pct_delta'])
+    assert len(subset) == 2
+    assert np.allclose(subset.loc[0, 'goals_per_game'], 1 / 3)
+    # The subset's own average shooting percentage is 0.2
+    assert np.allclose(subset.loc[0, 'shooting_pct_delta'], 0)
+
+
+class ETagSession:
+    """
+    Stand in for the NHL.com API, answering repeated requests with
+    304 Not Modified.
+    """
+
+    def get(self, url, headers=None):
+        response = requests.Response()
+        response.headers['ETag'] = '"teams"'
+        if headers.get('If-None-Match') == '"teams"':
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = 200
+            response._content = json.dumps({'data': [
+                {'teamId': 1, 'gamesPlayed': 82, 'points': 100}]}).encode()
+        return response
+
+
+def test_metrics_memo_unmodified(tmp_path, monkeypatch):
+    """
+    Test that metrics are reused when a query is requested again and
+    the API reports it unmodified.
+    """
+    monkeypatch.setenv('PYPUCK_DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(schema, '_fingerprints', None)
+    monkeypatch.setattr(http, 'session', ETagSession())
+    http.clear()
+    metrics.clear_memo()
+    calls = []
+
+    @metrics.register('test_metric', ['points'])
+    def test_metric(df):
+        calls.append(1)
+        return np.asarray(df['points'], dtype=float)
+
+    try:
+        for _ in range(3):
+            df = pypuck.team_stats('20192020', '20192020')
+            metrics.compute(df, ['test_metric'])
+        assert len(calls) == 1, "An unmodified query should use the memo"
+    finally:
+        del metrics.METRICS['test_metric']
+        http.clear()
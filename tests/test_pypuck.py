@@ -5,9 +5,23 @@
 This script tests the pypuck functions in the pypuck module.
 """
 
+import json
+
 from pypuck import pypuck
+from pypuck.helpers import http, schema
 import pandas as pd
 import pytest
+import requests
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """
+    Persist the pypuck data (e.g. the schema fingerprints) to a
+    temporary data directory rather than the home directory.
+    """
+    monkeypatch.setenv('PYPUCK_DATA_DIR', str(tmp_path / 'pypuck'))
+    monkeypatch.setattr(schema, '_fingerprints', None)
 
 
 def test_player_stats_good(start_date='2019-10-02', end_date='2020-02-28'):
@@ -328,3 +342,296 @@ def test_attendance_bad():
                                  start_season=1980, end_season=2001)
     assert str(e.value) == (
         "Expecting <class 'bool'> got <class 'int'> for regular")
+
+
+def test_attendance_compact(tmp_path):
+    """
+    Test function to check that the compact attendance chart
+    embeds a single shared dataset and that the data can be
+    referenced from a sidecar file.
+
+    Raises:
+        ValueError: A message if the chart payload is not compact.
+    """
+    a = pypuck.attendance(start_season=2000, end_season=2010, compact=True)
+    spec = a.to_dict()
+    assert spec['transform'][0]['fold'] == ['regular', 'playoff'], (
+        "Both attendance types should be folded from one dataset")
+    assert len(spec['datasets']) == 1, (
+        "The chart should only embed one copy of the data")
+
+    data_file = str(tmp_path / 'attendance.json')
+    a = pypuck.attendance(start_season=2000, end_season=2010,
+                          data_file=data_file)
+    spec = a.to_dict()
+    assert 'datasets' not in spec, (
+        "The chart should reference the data file instead of inlining it")
+    if len(pd.read_json(data_file)) != 11:
+        raise ValueError("The data file is missing attendance seasons")
+
+    # check an error will be raised if compact is not boolean value
+    with pytest.raises(Exception) as e:
+        assert pypuck.attendance(compact='yes')
+    assert str(e.value) == (
+        "Expecting <class 'bool'> got <class 'str'> for compact")
+
+
+def test_stats_cache():
+    """
+    Test function to check that player_stats and team_stats can be
+    served from the stale-while-revalidate cache.
+
+    Raises:
+        ValueError: A message if the cached result is wrong.
+    """
+    pypuck.live_cache.clear()
+    df = pypuck.team_stats(start_season='19531954', end_season='19581959',
+                           cache=True)
+    cached = pypuck.team_stats(start_season='19531954',
+                               end_season='19581959', cache=True)
+    if not df.equals(cached):
+        raise ValueError("The cached team_stats result is different")
+    assert cached.attrs['staleness'] >= 0, (
+        "A cached result should record its staleness")
+
+    df = pypuck.player_stats(start_date='2019-10-02', end_date='2020-02-28',
+                             cache=True)
+    if len(df) != 100:
+        raise ValueError("player_stats didn't return the top 100 players.")
+
+    with pytest.raises(Exception) as e:
+        assert pypuck.team_stats(cache='yes')
+    assert str(e.value) == ("Expecting <class 'bool'> got "
+                            "<class 'str'> for cache")
+
+
+def test_server_filter_draft(pick_number=1, round_number=2, year=2000):
+    """
+    Test function to check that filtering the draft picks on the API
+    returns the same picks as filtering them locally.
+
+    Keyword Arguments:
+        pick_number {int} -- pick_number to query (default: {1})
+        round_number {int} -- round_number to query (default: {2})
+        year {int} -- year to query (default: {2000})
+    """
+    pypuck.clear_draft_cache()
+    draft = pypuck.draft_pick(pick_number, round_number, year,
+                              server_filter=True)
+    if draft['playerName'].values != 'Ilya Nikulin':
+        raise ValueError('draft_pick() returned erroroneous information '
+                         'about specified parameters')
+
+    draft = pypuck.draft_pick(pick_number=1, year=2010, server_filter=True)
+    if draft.shape != (7, 5):
+        raise ValueError('draft_pick() returned erroneous '
+                         'information about specified parameters')
+
+    with pytest.raises(Exception) as e:
+        assert pypuck.draft_pick(server_filter=1)
+    assert str(e.value) == ("Expecting <class 'bool'> got <class 'int'> "
+                            "for server_filter")
+
+
+def test_arrow_output():
+    """
+    Test function to check that the endpoints can return Arrow tables
+    with the same data as the dataframes.
+
+    Raises:
+        ValueError: A message if the Arrow table is wrong.
+    """
+    pa = pytest.importorskip('pyarrow')
+
+    table = pypuck.team_stats(start_season='19531954',
+                              end_season='19581959', output='arrow')
+    assert isinstance(table, pa.Table), "team_stats should return a Table"
+    df = pypuck.team_stats(start_season='19531954', end_season='19581959')
+    if not table.to_pandas().equals(df):
+        raise ValueError("The Arrow table has different team stats")
+
+    table = pypuck.player_stats(start_date='2019-10-02',
+                                end_date='2020-02-28', output='arrow')
+    if table.num_rows != 100:
+        raise ValueError("player_stats didn't return the top 100 players.")
+
+    for server_filter in [False, True]:
+        table = pypuck.draft_pick(pick_number=1, year=2010,
+                                  server_filter=server_filter,
+                                  output='arrow')
+        if table.shape != (7, 5):
+            raise ValueError('draft_pick() returned erroneous '
+                             'information about specified parameters')
+
+    table = pypuck.attendance(start_season=2000, end_season=2010,
+                              output='arrow')
+    if table.num_rows != 11:
+        raise ValueError("attendance returned the wrong seasons")
+    assert table.schema.field('playoff').type == pa.int64()
+
+    with pytest.raises(Exception) as e:
+        assert pypuck.team_stats(output='polars')
+    assert str(e.value) == ("Invalid output polars, "
+                            "requires 'pandas' or 'arrow'")
+
+
+def test_column_projection():
+    """
+    Test function to check that player_stats and team_stats only keep
+    the requested columns.
+
+    Raises:
+        ValueError: A message if the wrong columns are returned.
+    """
+    columns = ['teamId', 'seasonId', 'points']
+    df = pypuck.team_stats(start_season='19531954', end_season='19581959',
+                           columns=columns)
+    if list(df.columns) != columns or len(df) != 36:
+        raise ValueError("team_stats didn't project the columns")
+
+    df = pypuck.player_stats(start_date='2019-10-02', end_date='2020-02-28',
+                             columns=['playerId', 'skaterFullName'])
+    if list(df.columns) != ['playerId', 'skaterFullName'] or len(df) != 100:
+        raise ValueError("player_stats didn't project the columns")
+
+    with pytest.raises(Exception) as e:
+        assert pypuck.team_stats(columns='points')
+    assert str(e.value) == ("Expecting (<class 'list'>, <class 'tuple'>) "
+                            "got <class 'str'> for columns")
+
+
+class FakeSession:
+    """
+    Stand in for the NHL.com APIs, answering every request with the
+    given records and recording the requested URLs.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.urls = []
+
+    def get(self, url, headers=None):
+        self.urls.append(url)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({'data': self.data}).encode()
+        return response
+
+
+def test_server_filter_draft_empty(monkeypatch):
+    """
+    Test function to check that a server filtered query matching no
+    picks raises the same error as filtering the picks locally.
+    """
+    monkeypatch.setattr(http, 'session', FakeSession([]))
+    pypuck.clear_draft_cache()
+    outputs = ['pandas']
+    if pypuck.pa is not None:
+        outputs.append('arrow')
+    for output in outputs:
+        with pytest.raises(AssertionError) as e:
+            pypuck.draft_pick(pick_number=30, year=1970, server_filter=True,
+                              output=output)
+        assert str(e.value) == ('Specified pick number didn`t exist in '
+                                'specified round or year')
+        df = pypuck.draft_pick(pick_number=30, year=1970, server_filter=True,
+                               output=output, allow_empty=True)
+        assert len(df) == 0 and list(df.column_names if output == 'arrow'
+                                     else df.columns) == pypuck.DRAFT_COLUMNS
+
+
+def test_draft_cache(monkeypatch):
+    """
+    Test function to check that only server filtered queries are
+    cached, and that the cache is bounded and expires.
+    """
+    session = FakeSession([{'playerName': 'Player', 'pickInRound': 1,
+                            'roundNumber': 1, 'triCode': 'VAN',
+                            'draftYear': year}
+                           for year in range(2000, 2003)])
+    monkeypatch.setattr(http, 'session', session)
+    monkeypatch.setattr(pypuck, 'DRAFT_CACHE_SIZE', 2)
+    pypuck.clear_draft_cache()
+
+    # The full draft history is requested every time
+    pypuck.draft_pick()
+    pypuck.draft_pick()
+    assert len(session.urls) == 2
+    assert len(pypuck._draft_cache) == 0
+
+    # A cached query, or a narrower one, isn't requested again
+    pypuck.draft_pick(year=2000, server_filter=True)
+    pypuck.draft_pick(round_number=1, year=2000, server_filter=True)
+    assert len(session.urls) == 3
+
+    # The least recently used query is evicted
+    pypuck.draft_pick(year=2001, server_filter=True)
+    pypuck.draft_pick(year=2002, server_filter=True)
+    assert len(pypuck._draft_cache) == 2
+    pypuck.draft_pick(year=2000, server_filter=True)
+    assert len(session.urls) == 6
+
+    # Expired queries are requested again
+    monkeypatch.setattr(pypuck, 'DRAFT_CACHE_TTL', 0)
+    pypuck.draft_pick(year=2000, server_filter=True)
+    assert len(session.urls) == 7
+    pypuck.clear_draft_cache()
+
+
+def test_column_projection_missing(tmp_path, monkeypatch):
+    """
+    Test function to check that a projected column the response doesn't
+    include is reported, and that an unwritable data directory doesn't
+    break the request.
+    """
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    monkeypatch.setenv('PYPUCK_DATA_DIR', str(blocker / 'pypuck'))
+    monkeypatch.setattr(http, 'session',
+                        FakeSession([{'teamId': 1, 'seasonId': 19531954,
+                                      'points': 90}]))
+    df = pypuck.team_stats(start_season='19531954', end_season='19531954')
+    assert list(df.columns) == ['teamId', 'seasonId', 'points']
+
+    with pytest.warns(schema.SchemaDriftWarning) as record:
+        df = pypuck.team_stats(start_season='19531954',
+                               end_season='19531954',
+                               columns=['teamId', 'pts'])
+    assert str(record[0].message) == (
+        "The team/summary fields don't include the requested "
+        "columns ['pts']")
+    assert record[0].filename == __file__
+
+
+def test_arrow_output_selected(monkeypatch):
+    """
+    Test function to check that the Arrow attendance only keeps the
+    selected attendance types, and that an empty projected response
+    keeps its columns.
+    """
+    pa = pytest.importorskip('pyarrow')
+    monkeypatch.setattr(http, 'session', FakeSession([
+        {'seasonId': 20002001, 'regularAttendance': 20000000,
+         'playoffAttendance': None, 'id': 1}]))
+    table = pypuck.attendance(playoffs=False, start_season=2000,
+                              end_season=2010, output='arrow')
+    assert table.column_names == ['seasonId', 'regular']
+    assert table.num_rows == 1
+    df = pypuck.attendance(playoffs=False, start_season=2000,
+                           end_season=2010, output='pandas')
+    assert list(df.columns) == ['seasonId', 'regular']
+    assert list(df.regular) == [20000000]
+
+    with pytest.raises(Exception) as e:
+        pypuck.attendance(regular=False, playoffs=False, output='arrow')
+    assert str(e.value) == "Must select at least one attendance type"
+    with pytest.raises(ValueError) as e:
+        pypuck.attendance(compact=True, output='arrow')
+    assert str(e.value) == "compact and data_file require output='chart'"
+
+    monkeypatch.setattr(http, 'session', FakeSession([]))
+    table = pypuck.team_stats(start_season='19531954', end_season='19531954',
+                              output='arrow', columns=['teamId', 'points'])
+    assert isinstance(table, pa.Table)
+    assert table.column_names == ['teamId', 'points']
+    assert table.num_rows == 0
@@ -0,0 +1,82 @@
+# authors: pypuck contributors
+# date: 2026-10-19
+
+"""
+This script tests the schema drift detection in the helpers module.
+"""
+
+import warnings
+
+import pytest
+
+from pypuck.helpers import schema
+
+
+@pytest.fixture
+def fingerprints(tmp_path, monkeypatch):
+    """
+    Persist the fingerprints to a temporary data directory.
+    """
+    monkeypatch.setenv('PYPUCK_DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(schema, '_fingerprints', None)
+    return tmp_path / schema.FINGERPRINT_FILE
+
+
+def test_schema_drift(fingerprints):
+    """
+    Test that added and removed fields raise a warning once, and that
+    the fingerprints are persisted.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        schema.check('team/summary', [{'teamId': 1, 'points': 90}])
+        schema.check('team/summary', [{'points': 80, 'teamId': 2}])
+        schema.check('team/summary', [])
+    assert fingerprints.exists()
+
+    with pytest.warns(schema.SchemaDriftWarning) as record:
+        schema.check('team/summary', [{'teamId': 1, 'pts': 90}])
+    assert str(record[0].message) == (
+        "The team/summary fields changed - added ['pts'], "
+        "removed ['points']")
+
+    # The new fields are remembered across sessions
+    schema._fingerprints = None
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        schema.check('team/summary', [{'teamId': 1, 'pts': 90}])
+        schema.check('skater/summary', [{'playerId': 1}])
+
+
+def test_schema_missing_columns(fingerprints):
+    """
+    Test that requested columns missing from every record raise a
+    warning, even for the first response.
+    """
+    with pytest.warns(schema.SchemaDriftWarning) as record:
+        schema.check('team/summary', [{'teamId': 1, 'points': 90}],
+                     ('teamId', 'pts'))
+    assert str(record[0].message) == (
+        "The team/summary fields don't include the requested "
+        "columns ['pts']")
+    # The warning points at the caller rather than the schema helper
+    assert record[0].filename == __file__
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        schema.check('team/summary', [{'teamId': 1}, {'points': 90}],
+                     ('teamId', 'points'))
+
+
+def test_schema_read_only(tmp_path, monkeypatch):
+    """
+    Test that the fingerprints are kept in memory when the data
+    directory can't be created.
+    """
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    monkeypatch.setenv('PYPUCK_DATA_DIR', str(blocker / 'pypuck'))
+    monkeypatch.setattr(schema, '_fingerprints', None)
+    schema.check('team/summary', [{'teamId': 1, 'points': 90}])
+    with pytest.warns(schema.SchemaDriftWarning):
+        schema.check('team/summary', [{'teamId': 1}])